@@ -0,0 +1,62 @@
+"""
+float64 vs float32 simulation: peak memory, throughput and price difference on the same draws.
+"""
+
+import time
+import tracemalloc
+
+import numpy as np
+
+from desk_sim.instruments import AutocallableWorstOf
+from desk_sim.market import MarketParams, make_time_grid
+from desk_sim.pricer_mc import price_autocallable_mc
+
+
+def run(product, market, grid, n_paths, dtype, n_repeats=3):
+    # timing without tracemalloc, which slows allocations down
+    times = []
+    for _ in range(n_repeats):
+        start = time.perf_counter()
+        price = price_autocallable_mc(product, market, grid, n_paths, rng=np.random.default_rng(0), dtype=dtype)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    price_autocallable_mc(product, market, grid, n_paths, rng=np.random.default_rng(0), dtype=dtype)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return price, min(times), peak
+
+
+def main():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.25, 0.5, 0.75, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.25, 0.30]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+
+    grid = make_time_grid(maturity=product.maturity, steps_per_year=252)
+    n_paths = 100_000
+
+    results = {}
+    for dtype in (np.float64, np.float32):
+        results[dtype] = run(product, market, grid, n_paths, dtype)
+        price, seconds, peak = results[dtype]
+        print(f"{np.dtype(dtype).name:8s}: price {price:.6f}  {n_paths / seconds:12,.0f} paths/s  "
+              f"peak {peak / 2**20:8.1f} MiB")
+
+    p64, t64, m64 = results[np.float64]
+    p32, t32, m32 = results[np.float32]
+    print(f"speed-up x{t64 / t32:.2f}, memory x{m64 / m32:.2f}, price difference {p32 - p64:+.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Run the benchmark suite, append the results to a JSON history and compare with a baseline.
+
+    python scripts/run_benchmarks.py --quick
+    python scripts/run_benchmarks.py --label baseline
+    python scripts/run_benchmarks.py --compare baseline --threshold 0.15
+
+Exits with status 1 when a regression beyond the threshold is found.
+"""
+
+import argparse
+import sys
+
+from desk_sim.bench import (
+    BENCHMARKS, default_cases, sweep, run_benchmarks, append_history, load_history, baseline_run, compare,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--history", default="bench_history.json", help="JSON history file")
+    parser.add_argument("--quick", action="store_true", help="one small case instead of the full sweep")
+    parser.add_argument("--n-paths", type=int, nargs="+", help="sweep these path counts")
+    parser.add_argument("--n-assets", type=int, nargs="+", default=[2])
+    parser.add_argument("--maturity", type=float, nargs="+", default=[1.0])
+    parser.add_argument("--steps-per-year", type=int, nargs="+", default=[252])
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="benchmarks to run")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--label", help="label stored with this run (e.g. 'baseline')")
+    parser.add_argument("--compare", nargs="?", const="", metavar="LABEL",
+                        help="compare with the latest run with LABEL (latest run if no label)")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative regression threshold")
+    args = parser.parse_args()
+
+    if args.n_paths:
+        cases = sweep(args.n_paths, args.n_assets, args.maturity, args.steps_per_year)
+    else:
+        cases = default_cases(quick=args.quick)
+
+    # read the baseline before this run is appended
+    baseline = None
+    if args.compare is not None:
+        baseline = baseline_run(load_history(args.history), args.compare or None)
+
+    records = run_benchmarks(cases, names=args.only, repeats=args.repeats)
+    append_history(args.history, records, label=args.label)
+
+    print(f"{'benchmark':32s} {'case':24s} {'wall [s]':>10s} {'paths/s':>14s} {'peak [MiB]':>11s}")
+    for r in records:
+        print(f"{r['benchmark']:32s} {r['case']:24s} {r['wall_time']:10.4f} {r['paths_per_sec']:14,.0f} "
+              f"{r['peak_mb']:11.1f}")
+
+    if baseline is None:
+        return 0
+    regressions = compare(records, baseline["records"], threshold=args.threshold)
+    if not regressions:
+        print(f"\nNo regression beyond {args.threshold:.0%} against the run of {baseline['timestamp']}.")
+        return 0
+    print(f"\nRegressions beyond {args.threshold:.0%} against the run of {baseline['timestamp']}:")
+    for r in regressions:
+        print(f"  {r['benchmark']} {r['case']} {r['metric']}: {r['baseline']:.4g} -> {r['current']:.4g} "
+              f"(x{r['ratio']:.2f})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,7 +3,7 @@ import numpy as np
 from desk_sim.instruments import AutocallableWorstOf
 from desk_sim.market import MarketParams, make_time_grid
 from desk_sim.pricer_mc import price_autocallable_mc
-from desk_sim.greeks import delta_fd, vega_fd
+from desk_sim.greeks import greeks_mc
 
 
 def main():
@@ -37,13 +37,28 @@ def main():
     for k, v in diag.items():
         print(f"{k}: {v}")
 
+    # same pricing, dropping autocalled paths after each observation date
+    price_es, diag_es = price_autocallable_mc(
+        product=product,
+        market=market,
+        grid=grid,
+        n_paths=50_000,
+        rng=np.random.default_rng(0),
+        return_diag=True,
+        backend="early_stop",
+    )
+    print(f"Price (early stop): {price_es:.4f}")
+    print("Survival per period:", diag_es["survival_counts"])
+    print(f"Work saved: {diag_es['work_saved']:.1%}")
+
     spot0 = np.array([100.0, 100.0])
 
-    deltas = delta_fd(product, market, grid, n_paths=30_000, spot0=spot0, rel_bump=0.01, rng_seed=0)
-    vegas = vega_fd(product, market, grid, n_paths=30_000, abs_bump=0.01, rng_seed=0)
+    greeks = greeks_mc(product, market, grid, n_paths=30_000, spot0=spot0,
+                       rel_bump=0.01, abs_bump=0.01, rng_seed=0)
 
-    print("Deltas:", deltas)
-    print("Vegas:", vegas)
+    print("Deltas:", greeks["delta"])
+    print("Gammas:", greeks["gamma"])
+    print("Vegas:", greeks["vega"])
 
 if __name__ == "__main__":
     main()
@@ -2,8 +2,7 @@ import numpy as np
 
 from desk_sim.instruments import AutocallableWorstOf
 from desk_sim.market import MarketParams, make_time_grid
-from desk_sim.pricer_mc import price_autocallable_mc
-from desk_sim.scenarios import base_scenario, vol_up, vol_down, corr_breakdown
+from desk_sim.stress import ShockSpec, shock_grid, run_stress
 
 
 def main():
@@ -24,21 +23,29 @@ def main():
 
     grid = make_time_grid(product.maturity, steps_per_year=252)
 
-    scenarios = {
-        "base": base_scenario(base_market),
-        "vol_up": vol_up(base_market, 0.2),
-        "vol_down": vol_down(base_market, 0.2),
-        "corr_breakdown": corr_breakdown(base_market, 0.0),
-    }
+    # same shocks as scenarios.vol_up / vol_down / corr_breakdown
+    shocks = [
+        ShockSpec("base"),
+        ShockSpec("vol_up", vol_mult=1.2),
+        ShockSpec("vol_down", vol_mult=0.8),
+        ShockSpec("corr_breakdown", corr_target=0.0),
+    ]
 
     print("Stress test pricing:")
-    for name, mkt in scenarios.items():
-        price = price_autocallable_mc(
-            product, mkt, grid,
-            n_paths=30_000,
-            rng=np.random.default_rng(0)
-        )
-        print(f"{name:15s}: {price:8.4f}")
+    table = run_stress(product, base_market, grid, shocks, n_paths=30_000, seed=0)
+    for row in table.itertuples():
+        print(f"{row.scenario:15s}: {row.price:8.4f}")
+
+    # full regulatory-style grid, priced on the same normals across all CPUs
+    grid_shocks = shock_grid(
+        vol_mults=(0.8, 1.0, 1.2, 1.5),
+        corr_targets=(None, 0.0, 0.9),
+        rate_shifts=(-0.01, 0.0, 0.01),
+        spot_shocks=(-0.3, -0.2, -0.1, 0.0, 0.1),
+    )
+    table = run_stress(product, base_market, grid, grid_shocks, n_paths=30_000, seed=0, n_workers=None)
+    print(f"\nShock grid: {len(table)} scenarios, worst PnL:")
+    print(table.nsmallest(5, "pnl")[["scenario", "price", "pnl", "pnl_std_error"]].to_string(index=False))
 
 
 if __name__ == "__main__":
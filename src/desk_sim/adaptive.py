@@ -0,0 +1,132 @@
+"""
+Adaptive path-count pricing: simulate in batches until a target standard error (absolute
+or relative to the price) is reached, the time budget runs out, or max_paths is hit.
+"""
+
+import time
+
+import numpy as np
+
+from desk_sim.instruments import AutocallableWorstOf, payoff_and_tau_batch
+from desk_sim.market import MarketParams, TimeGrid, obs_times_to_indices, sparse_grid_indices
+from desk_sim.mc_stats import RunningStats
+from desk_sim.pricer_mc import _discounted_payoffs_chunk
+from desk_sim.roll_pricer import simulate_relative_paths
+
+
+def price_to_tolerance(
+    product: AutocallableWorstOf,
+    market: MarketParams,
+    grid: TimeGrid,
+    target_stderr: float | None = None,
+    rel_tol: float | None = None,
+    time_budget: float | None = None,
+    batch_size: int = 10_000,
+    max_paths: int = 10_000_000,
+    rng: np.random.Generator | None = None,
+    sparse_grid: bool = True
+) -> tuple[float, dict]:
+    """
+    Price the autocallable from inception, adding batch_size paths at a time until
+    std_error <= target_stderr or std_error <= rel_tol * |price|.
+
+    Returns:
+        (price, diagnostics dict): the price_autocallable_mc keys plus "std_error",
+        "stop_reason" ("target_met", "time_budget" or "max_paths") and "elapsed" (seconds)
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    obs_idx = obs_times_to_indices(grid, product.obs_times)
+    sim_idx = None
+    if sparse_grid:
+        sim_idx, obs_idx = sparse_grid_indices(grid, obs_idx)
+
+    def next_batch(n: int):
+        return _discounted_payoffs_chunk(product, market, grid, n, rng, obs_idx, sim_idx)
+
+    return _run_batches(next_batch, target_stderr, rel_tol, time_budget, batch_size, max_paths)
+
+
+def price_from_state_to_tolerance(
+    product: AutocallableWorstOf,
+    market: MarketParams,
+    grid_remaining: TimeGrid,
+    level_now: np.ndarray,              # shape (n_assets,)
+    obs_indices_remaining: np.ndarray,  # indices in remaining grid
+    target_stderr: float | None = None,
+    rel_tol: float | None = None,
+    time_budget: float | None = None,
+    batch_size: int = 5_000,
+    max_paths: int = 1_000_000,
+    rng: np.random.Generator | None = None,
+    sparse_grid: bool = True
+) -> tuple[float, dict]:
+    """
+    Adaptive version of price_from_state_mc, for per-day use in the hedge loop.
+
+    Returns:
+        (price, diagnostics dict) as price_to_tolerance
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    r = float(market.rate)
+
+    def next_batch(n: int):
+        paths_rel, obs_idx = simulate_relative_paths(
+            grid_remaining, market, n, rng, obs_indices_remaining, sparse_grid
+        )
+        payoffs, taus = payoff_and_tau_batch(product, paths_rel * level_now[None, None, :], obs_idx)
+        call_count = int(np.count_nonzero(taus < product.maturity - 1e-15))
+        return np.exp(-r * taus) * payoffs, taus, call_count
+
+    return _run_batches(next_batch, target_stderr, rel_tol, time_budget, batch_size, max_paths)
+
+
+def _run_batches(
+    next_batch,
+    target_stderr: float | None,
+    rel_tol: float | None,
+    time_budget: float | None,
+    batch_size: int,
+    max_paths: int
+) -> tuple[float, dict]:
+    if target_stderr is None and rel_tol is None:
+        raise ValueError("give target_stderr and/or rel_tol")
+    if target_stderr is not None and target_stderr <= 0:
+        raise ValueError("target_stderr must be > 0")
+    if rel_tol is not None and rel_tol <= 0:
+        raise ValueError("rel_tol must be > 0")
+    if batch_size < 2:
+        raise ValueError("batch_size must be >= 2")
+    if max_paths < batch_size:
+        raise ValueError("max_paths must be >= batch_size")
+
+    start = time.perf_counter()
+    stats = RunningStats()
+    while True:
+        n = min(batch_size, max_paths - stats.n)
+        stats.update(*next_batch(n))
+
+        std_error = stats.std / np.sqrt(stats.n)
+        tolerance = min(
+            target_stderr if target_stderr is not None else np.inf,
+            rel_tol * abs(stats.mean) if rel_tol is not None else np.inf,
+        )
+        elapsed = time.perf_counter() - start
+
+        if std_error <= tolerance:
+            stop_reason = "target_met"
+        elif time_budget is not None and elapsed >= time_budget:
+            stop_reason = "time_budget"
+        elif stats.n >= max_paths:
+            stop_reason = "max_paths"
+        else:
+            continue
+        break
+
+    diagnostics = stats.to_diagnostics()
+    diagnostics["std_error"] = float(std_error)
+    diagnostics["stop_reason"] = stop_reason
+    diagnostics["elapsed"] = elapsed
+    return float(stats.mean), diagnostics
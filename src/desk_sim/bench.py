@@ -0,0 +1,260 @@
+"""
+Benchmark harness: time the simulator, payoff, pricer, greeks and hedge loop over a sweep of
+problem sizes, keep a JSON history of the results and flag regressions against a baseline.
+
+Each record holds the benchmark name, the case parameters, the best wall time over the
+repeats, paths per second and the peak traced memory (tracemalloc, measured in a separate
+run so it does not slow the timed ones).
+"""
+
+from dataclasses import dataclass, asdict
+import datetime
+import itertools
+import json
+import os
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+
+from desk_sim.instruments import AutocallableWorstOf, payoff_and_tau_from_levels, payoff_and_tau_batch
+from desk_sim.market import MarketParams, make_time_grid, obs_times_to_indices
+from desk_sim.dynamics import simulate_bs_normalised_levels
+from desk_sim.pricer_mc import price_autocallable_mc
+from desk_sim.greeks import delta_fd, vega_fd
+from desk_sim.hedge_sim import run_delta_hedge_one_path
+
+
+@dataclass(frozen=True)
+class BenchCase:
+    n_paths: int
+    n_assets: int = 2
+    maturity: float = 1.0
+    steps_per_year: int = 252
+
+    @property
+    def name(self) -> str:
+        return f"p{self.n_paths}_a{self.n_assets}_T{self.maturity:g}_s{self.steps_per_year}"
+
+
+def sweep(n_paths=(10_000,), n_assets=(2,), maturities=(1.0,), steps_per_year=(252,)) -> list[BenchCase]:
+    """
+    Cartesian product of the parameter values.
+    """
+    return [BenchCase(*values) for values in itertools.product(n_paths, n_assets, maturities, steps_per_year)]
+
+
+def default_cases(quick: bool = False) -> list[BenchCase]:
+    if quick:
+        return sweep(n_paths=(2_000,), n_assets=(2,), maturities=(1.0,), steps_per_year=(52,))
+    # the 100k-path, 3-year daily corner (a ~1.2 GB float64 cube at 4 assets) is left out:
+    # the sweep has to run on a laptop; pass --n-paths etc. to time it explicitly
+    cases = sweep(n_paths=(10_000, 100_000), n_assets=(2, 4), maturities=(1.0, 3.0), steps_per_year=(52, 252))
+    return [c for c in cases if not (c.n_paths >= 100_000 and c.maturity >= 3.0 and c.steps_per_year >= 252)]
+
+
+def case_inputs(case: BenchCase) -> tuple[AutocallableWorstOf, MarketParams, object]:
+    """
+    Quarterly-observed worst-of on n_assets underlyings, vols 20-30%, pairwise correlation 0.5.
+    """
+    product = AutocallableWorstOf(
+        maturity=case.maturity,
+        obs_times=np.arange(1, int(round(4 * case.maturity)) + 1) / 4.0,
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    corr = np.full((case.n_assets, case.n_assets), 0.5)
+    np.fill_diagonal(corr, 1.0)
+    market = MarketParams(rate=0.02, vols=np.linspace(0.2, 0.3, case.n_assets), corr=corr)
+    grid = make_time_grid(maturity=case.maturity, steps_per_year=case.steps_per_year)
+    return product, market, grid
+
+
+# ---------- benchmarks: (case) -> (callable, number of paths it processes) ----------
+
+def _bench_simulate(case: BenchCase):
+    _, market, grid = case_inputs(case)
+    return lambda: simulate_bs_normalised_levels(grid, market, case.n_paths, rng=np.random.default_rng(0)), case.n_paths
+
+
+def _bench_payoff_scalar(case: BenchCase):
+    # the scalar payoff is a per-path Python loop; time it on at most 1000 paths
+    product, market, grid = case_inputs(case)
+    n = min(case.n_paths, 1000)
+    paths = simulate_bs_normalised_levels(grid, market, n, rng=np.random.default_rng(0))
+    obs_idx = obs_times_to_indices(grid, product.obs_times)
+    return lambda: [payoff_and_tau_from_levels(product, path, obs_idx) for path in paths], n
+
+
+def _bench_payoff_batch(case: BenchCase):
+    product, market, grid = case_inputs(case)
+    paths = simulate_bs_normalised_levels(grid, market, case.n_paths, rng=np.random.default_rng(0))
+    obs_idx = obs_times_to_indices(grid, product.obs_times)
+    return lambda: payoff_and_tau_batch(product, paths, obs_idx), case.n_paths
+
+
+def _bench_price(case: BenchCase):
+    product, market, grid = case_inputs(case)
+    return lambda: price_autocallable_mc(product, market, grid, case.n_paths, rng=np.random.default_rng(0)), case.n_paths
+
+
+def _bench_price_fused(case: BenchCase):
+    product, market, grid = case_inputs(case)
+    return (
+        lambda: price_autocallable_mc(product, market, grid, case.n_paths, rng=np.random.default_rng(0), backend="fused"),
+        case.n_paths,
+    )
+
+
+def _bench_delta_fd(case: BenchCase):
+    product, market, grid = case_inputs(case)
+    spot0 = np.full(case.n_assets, 100.0)
+    return lambda: delta_fd(product, market, grid, case.n_paths, spot0), case.n_paths * (case.n_assets + 1)
+
+
+def _bench_vega_fd(case: BenchCase):
+    product, market, grid = case_inputs(case)
+    return lambda: vega_fd(product, market, grid, case.n_paths), case.n_paths * (case.n_assets + 1)
+
+
+def _bench_hedge(case: BenchCase):
+    # rolling revaluation: one master simulation, repriced on every date
+    product, market, grid = case_inputs(case)
+    return (
+        lambda: run_delta_hedge_one_path(product, market, grid, n_paths_pricing=case.n_paths, reval_mode="rolling"),
+        case.n_paths,
+    )
+
+
+BENCHMARKS = {
+    "simulate_bs_normalised_levels": _bench_simulate,
+    "payoff_and_tau_from_levels": _bench_payoff_scalar,
+    "payoff_and_tau_batch": _bench_payoff_batch,
+    "price_autocallable_mc": _bench_price,
+    "price_autocallable_mc_fused": _bench_price_fused,
+    "delta_fd": _bench_delta_fd,
+    "vega_fd": _bench_vega_fd,
+    "run_delta_hedge_one_path": _bench_hedge,
+}
+
+
+def run_benchmarks(
+    cases: list[BenchCase],
+    names: list[str] | None = None,
+    repeats: int = 3
+) -> list[dict]:
+    """
+    Run every named benchmark (default: all of BENCHMARKS) on every case.
+
+    Returns:
+        list of records with "benchmark", "case", the case fields, "wall_time" (best of
+        repeats, seconds), "paths_per_sec" and "peak_mb"
+    """
+    if repeats <= 0:
+        raise ValueError("repeats must be > 0")
+    names = list(BENCHMARKS) if names is None else list(names)
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError(f"unknown benchmarks: {sorted(unknown)}")
+
+    records = []
+    for name in names:
+        for case in cases:
+            fn, n_paths = BENCHMARKS[name](case)
+            wall_time = min(_timed(fn) for _ in range(repeats))
+
+            tracemalloc.start()
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            records.append({
+                "benchmark": name,
+                "case": case.name,
+                **asdict(case),
+                "wall_time": wall_time,
+                "paths_per_sec": n_paths / wall_time if wall_time > 0 else float("inf"),
+                "peak_mb": peak / 2**20,
+            })
+    return records
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+# ---------- history and regression tracking ----------
+
+def append_history(path: str, records: list[dict], label: str | None = None) -> dict:
+    """
+    Append one run (records plus environment metadata) to the JSON history file at path.
+    """
+    run = {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "label": label,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "records": records,
+    }
+    history = load_history(path)
+    history["runs"].append(run)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(history, f, indent=2)
+    os.replace(tmp, path)
+    return run
+
+
+def load_history(path: str) -> dict:
+    if not os.path.exists(path):
+        return {"runs": []}
+    with open(path) as f:
+        return json.load(f)
+
+
+def baseline_run(history: dict, label: str | None = None) -> dict:
+    """
+    The latest run with the given label (the latest run at all if label is None).
+    """
+    runs = [run for run in history["runs"] if label is None or run.get("label") == label]
+    if not runs:
+        raise ValueError("no baseline run in history" + ("" if label is None else f" with label {label!r}"))
+    return runs[-1]
+
+
+def compare(records: list[dict], baseline: list[dict], threshold: float = 0.1) -> list[dict]:
+    """
+    Benchmarks slower (wall time) or heavier (peak memory) than baseline by more than threshold
+    (relative). Records without a baseline counterpart are skipped.
+
+    Returns:
+        list of {"benchmark", "case", "metric", "baseline", "current", "ratio"} regressions
+    """
+    if threshold < 0:
+        raise ValueError("threshold must be >= 0")
+    reference = {(r["benchmark"], r["case"]): r for r in baseline}
+    regressions = []
+    for record in records:
+        base = reference.get((record["benchmark"], record["case"]))
+        if base is None:
+            continue
+        for metric in ("wall_time", "peak_mb"):
+            if base[metric] <= 0:
+                continue
+            ratio = record[metric] / base[metric]
+            if ratio > 1.0 + threshold:
+                regressions.append({
+                    "benchmark": record["benchmark"],
+                    "case": record["case"],
+                    "metric": metric,
+                    "baseline": base[metric],
+                    "current": record[metric],
+                    "ratio": ratio,
+                })
+    return regressions
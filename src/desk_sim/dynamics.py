@@ -1,19 +1,36 @@
 import numpy as np
-from desk_sim.market import MarketParams, TimeGrid
+from desk_sim.market import MarketParams, TimeGrid, cholesky_factor, jump_constants
+from desk_sim import profiling
 
 
 def simulate_bs_normalised_levels(
     grid: TimeGrid,
     market: MarketParams,
     n_paths: int,
-    rng: np.random.Generator | None = None
+    rng: np.random.Generator | None = None,
+    antithetic: bool = False,
+    dtype=np.float64,
+    out: np.ndarray | None = None,
+    normals_out: np.ndarray | None = None
 ) -> np.ndarray:
     """
     Simulate correlated Black–Scholes *normalised* levels:
         level_i(t) = S_i(t) / S_i(0)
 
+    Whole-cube kernel: all normals in one draw, one batched matmul with the Cholesky factor
+    and one cumsum of the log-increments, written in place into the output.
+
+    With antithetic=True (n_paths even) path p + n_paths // 2 uses the negated normals of path p.
+
+    dtype: float64 or float32 paths. The normals are always drawn in float64 (then cast), so
+    both precisions see the same draws for a given rng.
+    out: optional preallocated array of shape (n_paths, n_steps, n_assets) and dtype to write
+        the paths into (see path_buffer_view), e.g. reused across the days of a hedge loop.
+    normals_out: optional preallocated array of shape (n_paths, n_steps - 1, n_assets) and
+        dtype the normals are drawn into, likewise reused.
+
     Returns:
-        paths: shape (n_paths, n_steps, n_assets)
+        paths: shape (n_paths, n_steps, n_assets) (out itself when given)
     """
     if n_paths <= 0:
         raise ValueError("n_paths must be > 0")
@@ -22,30 +39,272 @@ def simulate_bs_normalised_levels(
 
     n_steps = grid.times.shape[0]
     n_assets = market.vols.shape[0]
+    dtype = _check_dtype(dtype)
 
-    r = float(market.rate)
-    vols = market.vols.astype(float)
+    # Z: (n_paths, n_steps - 1, n_assets) iid standard normals, drawn path-major so that
+    # simulating paths in chunks consumes the generator exactly like one big call
+    Z = standard_normals(rng, (n_paths, n_steps - 1, n_assets), antithetic, dtype, out=normals_out)
+    return levels_from_normals(grid, market, Z, np.arange(n_steps), dtype=dtype, out=out)
 
-    # Cholesky for correlation
-    L = np.linalg.cholesky(market.corr)
 
-    dt = float(grid.dt)
-    sqrt_dt = np.sqrt(dt)
+def simulate_bs_levels_at_indices(
+    grid: TimeGrid,
+    market: MarketParams,
+    n_paths: int,
+    sim_indices: np.ndarray,
+    rng: np.random.Generator | None = None,
+    sampler: str = "pseudo",
+    antithetic: bool = False,
+    dtype=np.float64,
+    out: np.ndarray | None = None,
+    normals_out: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Simulate the same normalised levels as simulate_bs_normalised_levels, but only at the
+    grid points sim_indices, using exact lognormal jumps between them. Valid because the
+    GBM has no monitoring between those dates.
 
-    # paths
-    paths = np.empty((n_paths, n_steps, n_assets), dtype=float)
-    paths[:, 0, :] = 1.0  # normalised start
+    sim_indices must be strictly increasing and start at 0 (see market.sparse_grid_indices).
+    sampler: "pseudo" (rng.standard_normal) or "sobol" (see draw_normals); antithetic, dtype,
+    out and normals_out (pseudo only) as in simulate_bs_normalised_levels.
 
-    drift = (r - 0.5 * vols**2) * dt  # shape (n_assets,)
+    Returns:
+        paths: shape (n_paths, len(sim_indices), n_assets)
+    """
+    if n_paths <= 0:
+        raise ValueError("n_paths must be > 0")
+    if rng is None:
+        rng = np.random.default_rng()
+
+    sim_indices = _check_sim_indices(grid, sim_indices)
+    n_assets = market.vols.shape[0]
 
-    for t in range(1, n_steps):
-        # Z: (n_paths, n_assets) iid standard normals
-        Z = rng.standard_normal(size=(n_paths, n_assets))
-        # correlated increments
-        dW = Z @ L.T  # (n_paths, n_assets)
+    if sampler == "pseudo":
+        Z = standard_normals(rng, (n_paths, sim_indices.shape[0] - 1, n_assets), antithetic, dtype, out=normals_out)
+    else:
+        Z = draw_normals(grid, sim_indices, n_paths, n_assets, rng, sampler=sampler, antithetic=antithetic)
+    return levels_from_normals(grid, market, Z, sim_indices, dtype=dtype, out=out)
 
-        incr = drift + vols * sqrt_dt * dW  # log-increment
-        paths[:, t, :] = paths[:, t - 1, :] * np.exp(incr)
+
+def draw_normals(
+    grid: TimeGrid,
+    sim_indices: np.ndarray,
+    n_paths: int,
+    n_assets: int,
+    rng: np.random.Generator,
+    sampler: str = "pseudo",
+    antithetic: bool = False
+) -> np.ndarray:
+    """
+    Standard normals driving the jumps between sim_indices, for levels_from_normals.
+
+    sampler="pseudo": iid draws from rng, path-major.
+    sampler="sobol": scrambled Sobol points (scramble seeded from rng) mapped to normals and
+        assembled by Brownian bridge over the simulated dates, so the first Sobol dimensions
+        set the terminal values and the later ones fill in the intermediate dates.
+        Needs scipy; n_paths should be a power of 2.
+    antithetic=True (n_paths even): the second half of the paths are the negated first half.
+
+    Returns:
+        Z: shape (n_paths, len(sim_indices) - 1, n_assets)
+    """
+    sim_indices = _check_sim_indices(grid, sim_indices)
+    n_jumps = sim_indices.shape[0] - 1
+
+    if sampler == "pseudo":
+        # Z: (n_paths, n_jumps, n_assets) iid standard normals, path-major
+        return standard_normals(rng, (n_paths, n_jumps, n_assets), antithetic)
+    if sampler != "sobol":
+        raise ValueError("sampler must be 'pseudo' or 'sobol'")
+    if antithetic:
+        if n_paths % 2:
+            raise ValueError("antithetic sampling needs an even n_paths")
+        half = draw_normals(grid, sim_indices, n_paths // 2, n_assets, rng, sampler=sampler)
+        return np.concatenate((half, -half), axis=0)
+    if n_jumps == 0:
+        return np.empty((n_paths, 0, n_assets), dtype=float)
+
+    try:
+        from scipy.stats import norm, qmc
+    except ImportError as exc:
+        raise ImportError("sampler='sobol' requires scipy (pip install autocallable-desk-sim[qmc])") from exc
+
+    with profiling.stage("dynamics.rng_sobol", paths=n_paths, nbytes=8 * n_paths * n_jumps * n_assets):
+        sobol = qmc.Sobol(d=n_jumps * n_assets, scramble=True, seed=rng)
+        u = sobol.random(n_paths)
+        u = np.clip(u, np.finfo(float).tiny, 1.0 - np.finfo(float).eps)
+        Z_bridge = norm.ppf(u).reshape(n_paths, n_jumps, n_assets)
+
+    jump_dt = float(grid.dt) * np.diff(sim_indices).astype(float)
+    with profiling.stage("dynamics.brownian_bridge", paths=n_paths):
+        return brownian_bridge_increments(Z_bridge, jump_dt)
+
+
+def brownian_bridge_increments(Z_bridge: np.ndarray, jump_dt: np.ndarray) -> np.ndarray:
+    """
+    Brownian-bridge construction over the dates t_k = cumsum(jump_dt).
+
+    Z_bridge[:, j, :] drives the j-th point in bridge order (terminal point first, then
+    recursive midpoints). Returns the standardised increments
+        (W(t_k) - W(t_{k-1})) / sqrt(jump_dt_k)
+    which are iid N(0, 1) in law, in date order, shape like Z_bridge.
+    """
+    n_paths, n_jumps, n_assets = Z_bridge.shape
+    jump_dt = np.asarray(jump_dt, dtype=float)
+    if jump_dt.shape != (n_jumps,):
+        raise ValueError("jump_dt must have one entry per jump")
+
+    t = np.concatenate(([0.0], np.cumsum(jump_dt)))     # dates 0..n_jumps
+    W = np.zeros((n_paths, n_jumps + 1, n_assets), dtype=float)
+
+    W[:, n_jumps, :] = np.sqrt(t[n_jumps]) * Z_bridge[:, 0, :]
+    j = 1
+    # (left, right) pairs of already-known points, bisected breadth-first
+    segments = [(0, n_jumps)]
+    while segments:
+        next_segments = []
+        for left, right in segments:
+            if right - left < 2:
+                continue
+            mid = (left + right) // 2
+            w_l = (t[right] - t[mid]) / (t[right] - t[left])
+            w_r = (t[mid] - t[left]) / (t[right] - t[left])
+            std = np.sqrt((t[mid] - t[left]) * (t[right] - t[mid]) / (t[right] - t[left]))
+            W[:, mid, :] = w_l * W[:, left, :] + w_r * W[:, right, :] + std * Z_bridge[:, j, :]
+            j += 1
+            next_segments.extend(((left, mid), (mid, right)))
+        segments = next_segments
+
+    return np.diff(W, axis=1) / np.sqrt(jump_dt)[None, :, None]
+
+
+def levels_from_normals(
+    grid: TimeGrid,
+    market: MarketParams,
+    Z: np.ndarray,
+    sim_indices: np.ndarray,
+    dtype=np.float64,
+    out: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Turn iid standard normals into normalised levels at the grid points sim_indices.
+    Keeping Z lets callers re-evaluate bumped markets on common random numbers.
+
+    Z: shape (n_paths, len(sim_indices) - 1, n_assets), one draw per jump
+    dtype: float64 or float32 levels (the transform runs in that precision)
+    out: optional preallocated output of shape (n_paths, len(sim_indices), n_assets) and dtype
+
+    Returns:
+        paths: shape (n_paths, len(sim_indices), n_assets)
+    """
+    sim_indices = _check_sim_indices(grid, sim_indices)
+    n_paths, n_jumps, n_assets = Z.shape
+    if n_jumps != sim_indices.shape[0] - 1:
+        raise ValueError("Z must have one draw per jump between sim_indices")
+    if n_assets != market.vols.shape[0]:
+        raise ValueError("Z must have one column per asset")
+
+    dtype = _check_dtype(dtype)
+    L = cholesky_factor(market).astype(dtype)
+
+    # jump lengths in years, consistent with the dense grid's constant dt
+    jump_dt = float(grid.dt) * np.diff(sim_indices).astype(float)  # shape (n_jumps,)
+    diffusion, drift = jump_constants(market, jump_dt)              # (n_jumps, n_assets) each
+
+    if out is None:
+        paths = np.empty((n_paths, n_jumps + 1, n_assets), dtype=dtype)
+        profiling.count("dynamics.alloc_paths", paths=n_paths, nbytes=paths.nbytes)
+    elif out.shape != (n_paths, n_jumps + 1, n_assets) or out.dtype != dtype:
+        raise ValueError("out must have shape (n_paths, n_dates, n_assets) and the requested dtype")
+    else:
+        paths = out
+    paths[:, 0, :] = 1.0
+
+    if n_jumps > 0:
+        # log-increments built in place in the output: correlate, scale, drift, cumsum, exp
+        log_levels = paths[:, 1:, :]
+        with profiling.stage("dynamics.cholesky_matmul", paths=n_paths):
+            np.matmul(Z.astype(dtype, copy=False), L.T, out=log_levels)
+        with profiling.stage("dynamics.drift_cumsum", paths=n_paths):
+            log_levels *= diffusion.astype(dtype, copy=False)
+            log_levels += drift.astype(dtype, copy=False)
+            np.cumsum(log_levels, axis=1, out=log_levels)
+        with profiling.stage("dynamics.exp", paths=n_paths):
+            np.exp(log_levels, out=log_levels)
 
     return paths
 
+
+def path_buffer_view(buffer: np.ndarray, shape: tuple, dtype=np.float64) -> np.ndarray:
+    """
+    C-contiguous view of the first prod(shape) elements of a contiguous buffer, for the out=
+    argument of the simulators: one buffer sized for the largest cube serves smaller ones.
+    """
+    dtype = _check_dtype(dtype)
+    if buffer.dtype != dtype or not buffer.flags.c_contiguous:
+        raise ValueError("buffer must be C-contiguous with the requested dtype")
+    size = int(np.prod(shape))
+    if buffer.size < size:
+        raise ValueError("buffer is too small for the requested shape")
+    return buffer.reshape(-1)[:size].reshape(shape)
+
+
+def standard_normals(
+    rng: np.random.Generator,
+    shape: tuple,
+    antithetic: bool,
+    dtype=np.float64,
+    block_elements: int = 2**20,
+    out: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Path-major standard normals of the given shape from rng, the stream every pseudo-random
+    simulator draws (antithetic: the second half of the paths negates the first).
+
+    dtype: float64, or float32 drawn in float64 blocks of block_elements and cast.
+    out: optional preallocated (shape, dtype) array the normals are written into.
+    """
+    if out is not None and (out.shape != tuple(shape) or out.dtype != np.dtype(dtype)):
+        raise ValueError("normals out must have the requested shape and dtype")
+    if antithetic:
+        if shape[0] % 2:
+            raise ValueError("antithetic sampling needs an even n_paths")
+        half_shape = (shape[0] // 2,) + tuple(shape[1:])
+        if out is None:
+            half = standard_normals(rng, half_shape, False, dtype, block_elements)
+            return np.concatenate((half, -half), axis=0)
+        standard_normals(rng, half_shape, False, dtype, block_elements, out=out[:shape[0] // 2])
+        np.negative(out[:shape[0] // 2], out=out[shape[0] // 2:])
+        return out
+    with profiling.stage("dynamics.rng", paths=shape[0], nbytes=int(np.prod(shape)) * np.dtype(dtype).itemsize):
+        if np.dtype(dtype) == np.float64:
+            return rng.standard_normal(size=shape, out=out)
+
+        # float64 draws in blocks of paths, cast into the narrower output: the same values as one
+        # float64 call (draws are path-major) without a full-size float64 temporary
+        if out is None:
+            out = np.empty(shape, dtype=dtype)
+        per_path = int(np.prod(shape[1:]))
+        block = max(1, block_elements // max(per_path, 1))
+        for start in range(0, shape[0], block):
+            stop = min(start + block, shape[0])
+            out[start:stop] = rng.standard_normal(size=(stop - start,) + tuple(shape[1:]))
+        return out
+
+
+def _check_dtype(dtype) -> np.dtype:
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float64, np.float32):
+        raise ValueError("dtype must be float64 or float32")
+    return dtype
+
+
+def _check_sim_indices(grid: TimeGrid, sim_indices: np.ndarray) -> np.ndarray:
+    sim_indices = np.asarray(sim_indices, dtype=int)
+    if sim_indices.ndim != 1 or sim_indices.size == 0 or sim_indices[0] != 0:
+        raise ValueError("sim_indices must be a 1D array starting at 0")
+    if not np.all(np.diff(sim_indices) > 0):
+        raise ValueError("sim_indices must be strictly increasing")
+    if sim_indices[-1] >= grid.times.shape[0]:
+        raise ValueError("sim_indices must lie within the grid")
+    return sim_indices
@@ -0,0 +1,91 @@
+"""
+Early termination of autocalled paths: simulate observation period by observation period
+and drop the paths redeemed at each observation date, so later periods only simulate the
+survivors. With a high call probability at the first dates most of the path-periods (and
+normals) of a full simulation are never drawn.
+
+Each period is one exact lognormal jump to its end date: only the observation dates and
+the maturity are read, and the jump has the same law as compounding the grid steps in
+between, so walking the intermediate steps would draw normals for values never used.
+
+The normals are drawn period by period for the surviving paths only, so the paths differ
+from the full simulation's for the same rng (same distribution, different stream).
+"""
+
+import numpy as np
+
+from desk_sim.instruments import AutocallableWorstOf
+from desk_sim.market import MarketParams, TimeGrid
+from desk_sim.dynamics import draw_normals, levels_from_normals
+from desk_sim import profiling
+
+
+def discounted_payoffs_by_period(
+    product: AutocallableWorstOf,
+    market: MarketParams,
+    grid: TimeGrid,
+    n_paths: int,
+    rng: np.random.Generator,
+    obs_idx: np.ndarray,
+    level_now: np.ndarray | None = None,
+    dtype=np.float64
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+    """
+    Discounted payoffs and redemption times of n_paths paths started at level_now (1 if None).
+
+    Periods run from one observation date to the next, then to the last grid date (the
+    maturity); each is simulated as a single jump for the paths still alive.
+
+    Returns:
+        disc_payoffs: shape (n_paths,)
+        taus: shape (n_paths,), redemption time in years
+        survival_counts: shape (n_periods,), paths still alive at the start of each period
+        simulated_steps: path-periods actually simulated (survival_counts.sum())
+    """
+    n_assets = market.vols.shape[0]
+    if n_assets < 2:
+        raise ValueError("Worst-of autocallable requires at least 2 assets")
+    obs_idx = np.asarray(obs_idx, dtype=int)
+    obs_times = np.asarray(product.obs_times, dtype=float)
+    r = float(market.rate)
+    last = grid.times.shape[0] - 1
+
+    # period ends: the observation dates, then the maturity if it is not one
+    ends = list(obs_idx) + ([last] if obs_idx.size == 0 or obs_idx[-1] != last else [])
+
+    disc = np.empty(n_paths)
+    taus = np.empty(n_paths)
+    alive = np.arange(n_paths)
+    level = np.ones((n_paths, n_assets)) if level_now is None else np.tile(np.asarray(level_now, float), (n_paths, 1))
+    survival = np.zeros(len(ends), dtype=int)
+    simulated_steps = 0
+
+    start = 0
+    for j, end in enumerate(ends):
+        survival[j] = alive.size
+        if alive.size == 0:
+            continue
+        length = int(end) - start
+        if length > 0:
+            sim_idx = np.array([0, length])
+            with profiling.stage("early_stop.period", paths=alive.size):
+                Z = draw_normals(grid, sim_idx, alive.size, n_assets, rng)
+                level *= levels_from_normals(grid, market, Z, sim_idx, dtype=dtype)[:, -1, :]
+            simulated_steps += alive.size
+        start = int(end)
+
+        if j < obs_idx.size:
+            # autocall check at observation j, then drop the redeemed paths
+            hit = np.min(level, axis=1) >= product.autocall_barrier
+            if np.any(hit):
+                tau = obs_times[j]
+                disc[alive[hit]] = np.exp(-r * tau) * product.notional * (1.0 + product.coupon_rate * tau)
+                taus[alive[hit]] = tau
+                alive, level = alive[~hit], level[~hit]
+
+    # no autocall: payoff at maturity
+    worst_T = np.min(level, axis=1)
+    payoff_T = np.where(worst_T >= product.protection_barrier, product.notional, product.notional * worst_T)
+    disc[alive] = np.exp(-r * product.maturity) * payoff_T
+    taus[alive] = product.maturity
+    return disc, taus, survival, simulated_steps
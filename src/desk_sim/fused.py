@@ -0,0 +1,161 @@
+"""
+Fused simulate-and-payoff backend: walk each path date by date, keeping only its current
+log-levels, check the autocall barrier at the observation dates and stop the path as soon
+as it is called. The (n_paths, n_dates, n_assets) level cube is never built.
+
+With numba installed the walk is a compiled kernel, parallel across paths; otherwise a
+pure-NumPy walk steps all still-alive paths of a block together. Both consume the normals
+in blocks of paths from the same path-major stream as dynamics.draw_normals, so for a
+given rng they price the same paths as the cube backend (up to floating-point rounding).
+"""
+
+import numpy as np
+
+from desk_sim.instruments import AutocallableWorstOf
+from desk_sim.market import MarketParams, TimeGrid, cholesky_factor, jump_constants
+from desk_sim.dynamics import standard_normals
+from desk_sim import profiling
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+NUMBA_AVAILABLE = numba is not None
+prange = numba.prange if NUMBA_AVAILABLE else range
+
+
+def discounted_payoffs_fused(
+    product: AutocallableWorstOf,
+    market: MarketParams,
+    grid: TimeGrid,
+    n_paths: int,
+    rng: np.random.Generator,
+    obs_idx: np.ndarray,
+    sim_idx: np.ndarray | None = None,
+    level_now: np.ndarray | None = None,
+    use_numba: bool | None = None,
+    block_elements: int = 2**20
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Discounted payoffs and redemption times of n_paths paths started at level_now (1 if None),
+    simulated on the dates sim_idx (every grid date if None) without storing the paths.
+
+    obs_idx indexes into the simulated dates; the last simulated date is the maturity.
+    use_numba: None uses the compiled kernel when numba is installed, False forces the
+        NumPy walk, True requires numba.
+    block_elements: normals drawn per block (bounds the memory besides the outputs).
+
+    Returns:
+        disc_payoffs: shape (n_paths,)
+        taus: shape (n_paths,), redemption time in years
+    """
+    if use_numba is None:
+        use_numba = NUMBA_AVAILABLE
+    if use_numba and not NUMBA_AVAILABLE:
+        raise ImportError("use_numba=True requires numba (pip install autocallable-desk-sim[jit])")
+
+    n_assets = market.vols.shape[0]
+    if n_assets < 2:
+        raise ValueError("Worst-of autocallable requires at least 2 assets")
+    sim_idx = np.arange(grid.times.shape[0]) if sim_idx is None else np.asarray(sim_idx, dtype=int)
+    n_jumps = sim_idx.shape[0] - 1
+    level_now = np.ones(n_assets) if level_now is None else np.asarray(level_now, dtype=float)
+
+    # observation number of each simulated date (-1: not an observation date)
+    obs_idx = np.asarray(obs_idx, dtype=int)
+    obs_at = np.full(n_jumps + 1, -1, dtype=np.int64)
+    obs_at[obs_idx] = np.arange(obs_idx.shape[0])
+
+    # per-jump constants, as in dynamics.levels_from_normals
+    r = float(market.rate)
+    L = cholesky_factor(market)
+    jump_dt = float(grid.dt) * np.diff(sim_idx).astype(float)
+    diffusion, drift = jump_constants(market, jump_dt)          # (n_jumps, n_assets) each
+    terms = (
+        np.asarray(product.obs_times, dtype=float), float(product.autocall_barrier),
+        float(product.protection_barrier), float(product.notional), float(product.coupon_rate),
+        float(product.maturity), r,
+    )
+
+    disc = np.empty(n_paths)
+    taus = np.empty(n_paths)
+    block = max(1, block_elements // max(n_jumps * n_assets, 1))
+    walk = _walk_kernel if use_numba else _walk_numpy
+    with profiling.stage("fused.walk", paths=n_paths):
+        for start in range(0, n_paths, block):
+            stop = min(start + block, n_paths)
+            Z = standard_normals(rng, (stop - start, n_jumps, n_assets), False)
+            walk(Z, L, diffusion, drift, level_now, obs_at, *terms, disc[start:stop], taus[start:stop])
+    return disc, taus
+
+
+def _walk_numpy(Z, L, diffusion, drift, level_now, obs_at, obs_times, autocall_barrier,
+                protection_barrier, notional, coupon_rate, maturity, r, disc, taus) -> None:
+    """
+    Step the alive paths of a block together, dropping them as they are called.
+    """
+    alive = np.arange(Z.shape[0])
+    x = np.zeros((Z.shape[0], Z.shape[2]))      # log relative levels of the alive paths
+    for p in range(obs_at.shape[0]):
+        if p > 0:
+            inc = Z[alive, p - 1, :] @ L.T
+            inc *= diffusion[p - 1]
+            inc += drift[p - 1]
+            x += inc
+        k = obs_at[p]
+        if k >= 0:
+            worst = np.min(level_now[None, :] * np.exp(x), axis=1)
+            hit = worst >= autocall_barrier
+            if np.any(hit):
+                tau = obs_times[k]
+                disc[alive[hit]] = np.exp(-r * tau) * notional * (1.0 + coupon_rate * tau)
+                taus[alive[hit]] = tau
+                alive, x = alive[~hit], x[~hit]
+                if alive.size == 0:
+                    return
+
+    # no autocall: payoff at maturity
+    worst_T = np.min(level_now[None, :] * np.exp(x), axis=1)
+    payoff_T = np.where(worst_T >= protection_barrier, notional, notional * worst_T)
+    disc[alive] = np.exp(-r * maturity) * payoff_T
+    taus[alive] = maturity
+
+
+def _walk_paths(Z, L, diffusion, drift, level_now, obs_at, obs_times, autocall_barrier,
+                protection_barrier, notional, coupon_rate, maturity, r, disc, taus) -> None:
+    """
+    One path at a time in O(n_assets) memory (the numba kernel; plain Python without numba).
+    """
+    n_paths, n_jumps, n_assets = Z.shape
+    for i in prange(n_paths):
+        x = np.zeros(n_assets)
+        called = False
+        for p in range(n_jumps + 1):
+            if p > 0:
+                for a in range(n_assets):
+                    s = 0.0
+                    for b in range(a + 1):      # L is lower triangular
+                        s += L[a, b] * Z[i, p - 1, b]
+                    x[a] += s * diffusion[p - 1, a] + drift[p - 1, a]
+            k = obs_at[p]
+            if k >= 0:
+                worst = level_now[0] * np.exp(x[0])
+                for a in range(1, n_assets):
+                    worst = min(worst, level_now[a] * np.exp(x[a]))
+                if worst >= autocall_barrier:
+                    tau = obs_times[k]
+                    disc[i] = np.exp(-r * tau) * notional * (1.0 + coupon_rate * tau)
+                    taus[i] = tau
+                    called = True
+                    break
+        if not called:
+            worst = level_now[0] * np.exp(x[0])
+            for a in range(1, n_assets):
+                worst = min(worst, level_now[a] * np.exp(x[a]))
+            payoff = notional if worst >= protection_barrier else notional * worst
+            disc[i] = np.exp(-r * maturity) * payoff
+            taus[i] = maturity
+
+
+_walk_kernel = numba.njit(parallel=True, cache=True)(_walk_paths) if NUMBA_AVAILABLE else None
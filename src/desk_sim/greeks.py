@@ -1,8 +1,11 @@
 import numpy as np
 
-from desk_sim.instruments import AutocallableWorstOf
-from desk_sim.market import MarketParams, TimeGrid
-from desk_sim.pricer_mc import price_autocallable_mc
+from desk_sim.instruments import AutocallableWorstOf, payoff_and_tau_batch
+from desk_sim.market import MarketParams, TimeGrid, obs_times_to_indices, sparse_grid_indices, compile_market
+from desk_sim.dynamics import draw_normals, levels_from_normals
+from desk_sim.pricer_mc import price_autocallable_mc, simulate_paths
+from desk_sim.path_cache import PathCache
+from desk_sim.memo import PricingMemo, memoized
 
 
 def _bump_spot0(spot0: np.ndarray, asset_idx: int, rel_bump: float) -> np.ndarray:
@@ -26,10 +29,18 @@ def delta_fd(
     n_paths: int,
     spot0: np.ndarray,
     rel_bump: float = 0.01,
-    rng_seed: int = 0
+    rng_seed: int = 0,
+    sampler: str = "pseudo",
+    path_cache: PathCache | None = None,
+    memo: PricingMemo | None = None,
+    dtype=np.float64
 ) -> np.ndarray:
     """
     Finite-difference delta per asset using bump-and-reprice with common random numbers.
+    sampler: "pseudo" or "sobol" (see dynamics.draw_normals).
+    path_cache: optional on-disk path cache; the base and bumped prices share one entry.
+    memo: optional in-process memo of the base and bumped prices (shared with vega_fd).
+    dtype: precision of the simulated paths (see price_autocallable_mc).
 
     Note: In the current V1 implementation, dynamics simulate *normalised levels* and do not
     explicitly use spot0. To keep the interface desk-like, we interpret delta here as sensitivity
@@ -43,8 +54,7 @@ def delta_fd(
     deltas = np.empty(n_assets, dtype=float)
 
     # Base price (use same seed)
-    base_rng = np.random.default_rng(rng_seed)
-    base_price = price_autocallable_mc(product, market, grid, n_paths, rng=base_rng, return_diag=False)
+    base_price = _seeded_price(product, market, grid, n_paths, rng_seed, sampler, path_cache, memo, dtype)
 
     for i in range(n_assets):
         # In a normalised-level simulator, "spot0 bump" should ideally feed into dynamics.
@@ -60,8 +70,14 @@ def delta_fd(
         # we can model that by scaling the entire path for that asset after simulation. We'll do that in pricer.
         #
         # -> implement delta by calling a helper pricer that scales one asset paths.
-        bumped_price = _price_with_asset_scaling(
-            product, market, grid, n_paths, asset_idx=i, scale=(1.0 + rel_bump), rng_seed=rng_seed
+        bumped_price = memoized(
+            memo,
+            lambda: _price_with_asset_scaling(
+                product, market, grid, n_paths, asset_idx=i, scale=(1.0 + rel_bump), rng_seed=rng_seed,
+                sampler=sampler, path_cache=path_cache, dtype=dtype
+            ),
+            "price_with_asset_scaling", product, market, grid, n_paths, i, 1.0 + rel_bump, rng_seed, sampler,
+            np.dtype(dtype).name,
         )
 
         deltas[i] = (bumped_price - base_price) / (spot0[i] * rel_bump)
@@ -75,32 +91,139 @@ def vega_fd(
     grid: TimeGrid,
     n_paths: int,
     abs_bump: float = 0.01,
-    rng_seed: int = 0
+    rng_seed: int = 0,
+    sampler: str = "pseudo",
+    path_cache: PathCache | None = None,
+    memo: PricingMemo | None = None,
+    dtype=np.float64
 ) -> np.ndarray:
     """
     Finite-difference vega per asset: dPrice/dVol_i (vol bump in absolute terms, e.g. 0.01 = +1 vol point)
-    Uses common random numbers.
+    Uses common random numbers. sampler: "pseudo" or "sobol" (see dynamics.draw_normals).
+    path_cache: optional on-disk path cache (one entry per bumped market).
+    memo: optional in-process memo of the base and bumped prices (shared with delta_fd).
+    dtype: precision of the simulated paths (see price_autocallable_mc).
     """
     n_assets = market.vols.shape[0]
     vegas = np.empty(n_assets, dtype=float)
 
-    base_rng = np.random.default_rng(rng_seed)
-    base_price = price_autocallable_mc(product, market, grid, n_paths, rng=base_rng, return_diag=False)
+    # validated and factorised once; the bumped markets reuse the Cholesky factor
+    market = compile_market(market)
+    base_price = _seeded_price(product, market, grid, n_paths, rng_seed, sampler, path_cache, memo, dtype)
 
     for i in range(n_assets):
-        bumped_market = MarketParams(
-            rate=market.rate,
-            vols=_bump_vols(market.vols, i, abs_bump),
-            corr=market.corr
-        )
-        bumped_rng = np.random.default_rng(rng_seed)
-        bumped_price = price_autocallable_mc(product, bumped_market, grid, n_paths, rng=bumped_rng, return_diag=False)
+        bumped_market = market.with_vols(_bump_vols(market.vols, i, abs_bump))
+        bumped_price = _seeded_price(product, bumped_market, grid, n_paths, rng_seed, sampler, path_cache, memo, dtype)
 
         vegas[i] = (bumped_price - base_price) / abs_bump
 
     return vegas
 
 
+def greeks_mc(
+    product: AutocallableWorstOf,
+    market: MarketParams,
+    grid: TimeGrid,
+    n_paths: int,
+    spot0: np.ndarray,
+    rel_bump: float = 0.01,
+    abs_bump: float = 0.01,
+    rng_seed: int = 0,
+    sparse_grid: bool = False,
+    sampler: str = "pseudo",
+    dtype=np.float64
+) -> dict:
+    """
+    Price, delta, gamma and vega per asset from a single set of normals.
+
+    The normals are drawn once; the base price, every spot bump (level column scaled by
+    1 +/- rel_bump) and every vol bump (+/- abs_bump, same normals re-transformed) are
+    evaluated on them, so all greeks use common random numbers and nothing is re-simulated.
+    Delta and vega are central differences; delta and gamma are per unit of spot0, as in delta_fd.
+    sampler: "pseudo" or "sobol" (see dynamics.draw_normals); dtype: precision of the paths.
+
+    Returns:
+        dict with "price" (float), "delta", "gamma", "vega" (each shape (n_assets,)) and the
+        bumped prices "price_spot_up", "price_spot_down", "price_vol_up", "price_vol_down"
+    """
+    if n_paths <= 0:
+        raise ValueError("n_paths must be > 0")
+    spot0 = np.asarray(spot0, dtype=float)
+    n_assets = market.vols.shape[0]
+    if spot0.shape != (n_assets,):
+        raise ValueError("spot0 must have shape (n_assets,)")
+
+    obs_idx = obs_times_to_indices(grid, product.obs_times)
+    if sparse_grid:
+        sim_idx, obs_idx = sparse_grid_indices(grid, obs_idx)
+    else:
+        sim_idx = np.arange(grid.times.shape[0])
+
+    rng = np.random.default_rng(rng_seed)
+    Z = draw_normals(grid, sim_idx, n_paths, n_assets, rng, sampler=sampler)
+
+    market = compile_market(market)
+    r = float(market.rate)
+
+    def disc_mean(paths: np.ndarray) -> float:
+        payoffs, taus = payoff_and_tau_batch(product, paths, obs_idx)
+        return float(np.mean(np.exp(-r * taus) * payoffs))
+
+    paths = levels_from_normals(grid, market, Z, sim_idx, dtype=dtype)
+    price = disc_mean(paths)
+
+    spot_up = np.empty(n_assets, dtype=float)
+    spot_down = np.empty(n_assets, dtype=float)
+    for i in range(n_assets):
+        col = paths[:, :, i].copy()
+        paths[:, :, i] = col * (1.0 + rel_bump)
+        spot_up[i] = disc_mean(paths)
+        paths[:, :, i] = col * (1.0 - rel_bump)
+        spot_down[i] = disc_mean(paths)
+        paths[:, :, i] = col
+
+    vol_up = np.empty(n_assets, dtype=float)
+    vol_down = np.empty(n_assets, dtype=float)
+    for i in range(n_assets):
+        for sign, out in ((1.0, vol_up), (-1.0, vol_down)):
+            bumped_market = market.with_vols(_bump_vols(market.vols, i, sign * abs_bump))
+            out[i] = disc_mean(levels_from_normals(grid, bumped_market, Z, sim_idx, dtype=dtype))
+
+    h = spot0 * rel_bump
+    return {
+        "price": price,
+        "delta": (spot_up - spot_down) / (2.0 * h),
+        "gamma": (spot_up - 2.0 * price + spot_down) / h**2,
+        "vega": (vol_up - vol_down) / (2.0 * abs_bump),
+        "price_spot_up": spot_up,
+        "price_spot_down": spot_down,
+        "price_vol_up": vol_up,
+        "price_vol_down": vol_down,
+    }
+
+
+def _seeded_price(
+    product: AutocallableWorstOf,
+    market: MarketParams,
+    grid: TimeGrid,
+    n_paths: int,
+    rng_seed: int,
+    sampler: str,
+    path_cache: PathCache | None,
+    memo: PricingMemo | None,
+    dtype=np.float64
+) -> float:
+    """
+    price_autocallable_mc with a fresh generator seeded with rng_seed, through memo if given.
+    """
+    return memoized(
+        memo,
+        lambda: price_autocallable_mc(product, market, grid, n_paths, rng=np.random.default_rng(rng_seed),
+                                      sampler=sampler, path_cache=path_cache, dtype=dtype),
+        "price_autocallable_mc", product, market, grid, n_paths, rng_seed, sampler, np.dtype(dtype).name,
+    )
+
+
 def _price_with_asset_scaling(
     product: AutocallableWorstOf,
     market: MarketParams,
@@ -108,28 +231,26 @@ def _price_with_asset_scaling(
     n_paths: int,
     asset_idx: int,
     scale: float,
-    rng_seed: int
+    rng_seed: int,
+    sampler: str = "pseudo",
+    path_cache: PathCache | None = None,
+    dtype=np.float64
 ) -> float:
     """
     Helper: price the product where one asset path is scaled by a constant factor.
     This emulates a spot0 bump in a normalised-level simulator.
     Uses common random numbers via rng_seed.
     """
-    # Import locally to avoid circular import issues if you refactor later
-    from desk_sim.dynamics import simulate_bs_normalised_levels
-    from desk_sim.market import obs_times_to_indices
-    from desk_sim.instruments import payoff_and_tau_from_levels
-
     rng = np.random.default_rng(rng_seed)
-    paths = simulate_bs_normalised_levels(grid=grid, market=market, n_paths=n_paths, rng=rng)
+    paths = simulate_paths(grid, market, n_paths, rng, sampler=sampler, path_cache=path_cache, dtype=dtype)
+    if not paths.flags.writeable:
+        paths = np.array(paths)  # cached paths are a read-only memmap
     paths[:, :, asset_idx] *= scale
 
     obs_idx = obs_times_to_indices(grid, product.obs_times)
     r = float(market.rate)
 
-    disc = np.empty(n_paths, dtype=float)
-    for p in range(n_paths):
-        payoff, tau = payoff_and_tau_from_levels(product, paths[p], obs_idx)
-        disc[p] = np.exp(-r * tau) * payoff
+    payoffs, taus = payoff_and_tau_batch(product, paths, obs_idx)
+    disc = np.exp(-r * taus) * payoffs
 
     return float(np.mean(disc))
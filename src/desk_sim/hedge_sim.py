@@ -1,10 +1,17 @@
 import numpy as np
 import pandas as pd
 
-from desk_sim.market import make_remaining_grid, remaining_obs_times, obs_times_to_indices
-from desk_sim.roll_pricer import price_from_state_mc
-from desk_sim.roll_greeks import delta_from_state_fd
+from desk_sim.roll_pricer import (
+    _seeded_price_from_state, price_from_relative_paths, prices_from_relative_paths, relative_paths_from_master,
+    remaining_product,
+)
+from desk_sim.roll_greeks import delta_from_state_fd, delta_from_relative_paths
+from desk_sim.lr_greeks import delta_from_state_lr
+from desk_sim.adaptive import price_from_state_to_tolerance
 from desk_sim.dynamics import simulate_bs_normalised_levels
+from desk_sim.memo import memoized
+from desk_sim.market import compile_market
+from desk_sim import profiling
 
 def run_delta_hedge_one_path(
     product,
@@ -13,12 +20,48 @@ def run_delta_hedge_one_path(
     n_paths_pricing: int = 20000,
     rel_bump: float = 0.01,
     rng_seed_path: int = 123,
-    rng_seed_pricer: int = 0
+    rng_seed_pricer: int = 0,
+    delta_method: str = "fd",
+    reval_mode: str = "resimulate",
+    pricing_proxy=None,
+    target_stderr: float | None = None,
+    memo=None,
+    dtype=np.float64
 ) -> pd.DataFrame:
     """
     Simulate one realised path, reprice daily, compute delta, hedge, and compute PnL.
-    Returns a DataFrame with time series.
+    delta_method: "fd" (bump-and-reprice) or "lr" (likelihood ratio, no re-simulation).
+    reval_mode: "resimulate" (fresh pricing paths every day) or "rolling" (one master
+        pricing simulation on the full grid, reused every day from the current date on;
+        delta is then bump-and-reprice on the same paths).
+    pricing_proxy: optional proxy.RegressionProxy built on full_grid; when given, V and delta
+        are read from it instead of Monte Carlo (delta_method and reval_mode are ignored).
+    target_stderr: with reval_mode="resimulate", price V adaptively in batches until its
+        standard error reaches target_stderr, with n_paths_pricing as the cap; the paths
+        used each day go to column "n_paths_V".
+    memo: optional memo.PricingMemo for the reval_mode="resimulate" prices and deltas. The
+        day's V and the fd delta's base price are the same repricing, and a rerun with the
+        same seeds is served from the memo.
+    dtype: precision of the pricing paths (fd deltas, resimulated and rolling prices);
+        the realised path, adaptive (target_stderr) pricing and lr deltas stay float64.
+    Returns a DataFrame with time series (under profiling.session(), df.attrs["profile"]
+    holds the per-stage timings and counts).
     """
+    if delta_method not in ("fd", "lr"):
+        raise ValueError("delta_method must be 'fd' or 'lr'")
+    if reval_mode not in ("resimulate", "rolling"):
+        raise ValueError("reval_mode must be 'resimulate' or 'rolling'")
+    if reval_mode == "rolling" and delta_method != "fd":
+        raise ValueError("reval_mode='rolling' supports delta_method='fd' only")
+    if target_stderr is not None and reval_mode != "resimulate":
+        raise ValueError("target_stderr needs reval_mode='resimulate'")
+
+    if pricing_proxy is not None and pricing_proxy.times.shape[0] != full_grid.times.shape[0] - 1:
+        raise ValueError("pricing_proxy was built on a different grid")
+
+    # one validation and Cholesky factorisation for the hundreds of daily repricings
+    market = compile_market(market)
+
     rng_path = np.random.default_rng(rng_seed_path)
     realised = simulate_bs_normalised_levels(full_grid, market, n_paths=1, rng=rng_path)[0]
     # realised shape: (n_steps, n_assets)
@@ -30,6 +73,19 @@ def run_delta_hedge_one_path(
     q = np.zeros(n_assets)
     B = 0.0
 
+    master = None
+    if reval_mode == "rolling" and pricing_proxy is None:
+        master = simulate_bs_normalised_levels(
+            full_grid, market, n_paths=n_paths_pricing, rng=np.random.default_rng(rng_seed_pricer), dtype=dtype
+        )
+
+    # one scratch cube of paths and one of normals for every resimulation of the loop (the
+    # remaining grid only shrinks); only the seeded V and the fd deltas reprice through them
+    path_buffer = normals_buffer = None
+    if reval_mode == "resimulate" and pricing_proxy is None and (target_stderr is None or delta_method == "fd"):
+        path_buffer = np.empty(n_paths_pricing * n_steps * n_assets, dtype=dtype)
+        normals_buffer = np.empty(n_paths_pricing * (n_steps - 1) * n_assets, dtype=dtype)
+
     rows = []
 
     # Initial valuation and hedge
@@ -38,38 +94,65 @@ def run_delta_hedge_one_path(
         level_now = realised[t_idx, :].copy()
 
         # build remaining product + grid
-        rem_grid = make_remaining_grid(full_grid, t_idx)
-        rem_obs_times = remaining_obs_times(product.obs_times, now_time)
-
-        # if no remaining obs times, keep maturity only (your payoff already handles maturity)
-        if rem_obs_times.size == 0:
-            obs_idx = np.array([len(rem_grid.times) - 1], dtype=int)
-            product_rem = product  # maturity in payoff handled by last point
-        else:
-            # product for remaining horizon: shift maturity
-            product_rem = type(product)(
-                maturity=float(product.maturity - now_time),
-                obs_times=rem_obs_times,
-                coupon_rate=product.coupon_rate,
-                autocall_barrier=product.autocall_barrier,
-                protection_barrier=product.protection_barrier,
-                notional=product.notional,
-            )
-            obs_idx = obs_times_to_indices(rem_grid, product_rem.obs_times)
+        product_rem, rem_grid, obs_idx = remaining_product(product, full_grid, t_idx)
 
         # price and delta at current state
-        V = price_from_state_mc(
-            product_rem, market, rem_grid, level_now, obs_idx,
-            n_paths=n_paths_pricing,
-            rng=np.random.default_rng(rng_seed_pricer + t_idx),
-        )
+        with profiling.stage("hedge.reval", paths=n_paths_pricing):
+            if pricing_proxy is not None:
+                V = pricing_proxy.price(t_idx, level_now)
+                delta = pricing_proxy.delta(t_idx, level_now)
+            elif master is not None:
+                paths_rel, obs_pos = relative_paths_from_master(master, t_idx, obs_idx)
+                V = price_from_relative_paths(product_rem, market, paths_rel, level_now, obs_pos)
+                delta = delta_from_relative_paths(product_rem, market, paths_rel, level_now, obs_pos, rel_bump=rel_bump)
+            else:
+                if target_stderr is not None:
+                    V, diag_V = memoized(
+                        memo,
+                        lambda: price_from_state_to_tolerance(
+                            product_rem, market, rem_grid, level_now, obs_idx,
+                            target_stderr=target_stderr,
+                            batch_size=min(5000, n_paths_pricing),
+                            max_paths=n_paths_pricing,
+                            rng=np.random.default_rng(rng_seed_pricer + t_idx),
+                        ),
+                        "price_from_state_to_tolerance", product_rem, market, rem_grid, level_now, obs_idx,
+                        target_stderr, n_paths_pricing, rng_seed_pricer + t_idx,
+                    )
+                    n_paths_V = diag_V["n_paths"]
+                else:
+                    V = _seeded_price_from_state(
+                        product_rem, market, rem_grid, level_now, obs_idx,
+                        n_paths=n_paths_pricing,
+                        rng_seed=rng_seed_pricer + t_idx,
+                        memo=memo,
+                        dtype=dtype,
+                        path_buffer=path_buffer,
+                        normals_buffer=normals_buffer,
+                    )
 
-        delta = delta_from_state_fd(
-            product_rem, market, rem_grid, level_now, obs_idx,
-            n_paths=n_paths_pricing,
-            rel_bump=rel_bump,
-            rng_seed=rng_seed_pricer + t_idx,
-        )
+                if delta_method == "lr":
+                    delta = memoized(
+                        memo,
+                        lambda: delta_from_state_lr(
+                            product_rem, market, rem_grid, level_now, obs_idx,
+                            n_paths=n_paths_pricing,
+                            rng_seed=rng_seed_pricer + t_idx,
+                        ),
+                        "delta_from_state_lr", product_rem, market, rem_grid, level_now, obs_idx,
+                        n_paths_pricing, rng_seed_pricer + t_idx,
+                    )
+                else:
+                    delta = delta_from_state_fd(
+                        product_rem, market, rem_grid, level_now, obs_idx,
+                        n_paths=n_paths_pricing,
+                        rel_bump=rel_bump,
+                        rng_seed=rng_seed_pricer + t_idx,
+                        memo=memo,
+                        dtype=dtype,
+                        path_buffer=path_buffer,
+                        normals_buffer=normals_buffer,
+                    )
 
         # Underlying "prices" for hedge: use normalised levels as proxy prices
         S = level_now
@@ -107,14 +190,152 @@ def run_delta_hedge_one_path(
             "hedge_value": hedge_value,
             "hedge_value_next": hedge_value_next,
         })
+        if target_stderr is not None:
+            rows[-1]["n_paths_V"] = n_paths_V
 
-    df = pd.DataFrame(rows)
+    with profiling.stage("hedge.frame"):
+        df = pd.DataFrame(rows)
 
-    # Simple PnL proxy: changes in (product value + hedge value)
-    # Align next step product value by shifting
-    df["V_product_next"] = df["V_product"].shift(-1)
-    df["pnl_product"] = df["V_product_next"] - df["V_product"]
-    df["pnl_hedge"] = df["hedge_value_next"] - df["hedge_value"]
-    df["pnl_total"] = df["pnl_product"] + df["pnl_hedge"]
+        # Simple PnL proxy: changes in (product value + hedge value)
+        # Align next step product value by shifting
+        df["V_product_next"] = df["V_product"].shift(-1)
+        df["pnl_product"] = df["V_product_next"] - df["V_product"]
+        df["pnl_hedge"] = df["hedge_value_next"] - df["hedge_value"]
+        df["pnl_total"] = df["pnl_product"] + df["pnl_hedge"]
 
+    if profiling.is_enabled():
+        df.attrs["profile"] = profiling.report()
     return df
+
+
+def run_delta_hedge_batch(
+    product,
+    market,
+    full_grid,
+    n_realised: int = 100,
+    n_paths_pricing: int = 5000,
+    rel_bump: float = 0.01,
+    rng_seed_path: int = 123,
+    rng_seed_pricer: int = 0
+) -> dict:
+    """
+    Delta-hedge n_realised simulated paths in lockstep, with array-valued hedge state.
+
+    Same hedging and PnL conventions as run_delta_hedge_one_path with reval_mode="rolling":
+    one master pricing simulation is shared by all realised paths and all days, and delta is
+    bump-and-reprice on it. Realised path 0 is the path run_delta_hedge_one_path simulates
+    for the same rng_seed_path.
+
+    Returns:
+        dict of columnar arrays, indexed [path, day(, asset)]:
+            "t_idx", "time": shape (n_days,)
+            "S", "delta", "q": shape (n_realised, n_days, n_assets)
+            "V_product", "cash", "hedge_value", "hedge_value_next",
+            "pnl_product", "pnl_hedge", "pnl_total": shape (n_realised, n_days)
+        pnl_product (and so pnl_total) is NaN on the last day, as in the one-path DataFrame.
+    """
+    if n_realised <= 0:
+        raise ValueError("n_realised must be > 0")
+
+    rng_path = np.random.default_rng(rng_seed_path)
+    realised = simulate_bs_normalised_levels(full_grid, market, n_paths=n_realised, rng=rng_path)
+    # realised shape: (n_realised, n_steps, n_assets)
+
+    _, n_steps, n_assets = realised.shape
+    n_days = n_steps - 1
+    times = full_grid.times
+
+    master = simulate_bs_normalised_levels(
+        full_grid, market, n_paths=n_paths_pricing, rng=np.random.default_rng(rng_seed_pricer)
+    )
+
+    V = np.empty((n_realised, n_days))
+    delta = np.empty((n_realised, n_days, n_assets))
+    q_hist = np.empty((n_realised, n_days, n_assets))
+    cash = np.empty((n_realised, n_days))
+    hedge_value = np.empty((n_realised, n_days))
+    hedge_value_next = np.empty((n_realised, n_days))
+
+    # Hedge state per realised path: q in underlyings, cash B
+    q = np.zeros((n_realised, n_assets))
+    B = np.zeros(n_realised)
+
+    for t_idx in range(n_days):
+        S = realised[:, t_idx, :]
+
+        product_rem, _, obs_idx = remaining_product(product, full_grid, t_idx)
+        paths_rel, obs_pos = relative_paths_from_master(master, t_idx, obs_idx)
+
+        V[:, t_idx] = prices_from_relative_paths(product_rem, market, paths_rel, S, obs_pos)
+        for i in range(n_assets):
+            bumped = S.copy()
+            bumped[:, i] *= (1.0 + rel_bump)
+            price_b = prices_from_relative_paths(product_rem, market, paths_rel, bumped, obs_pos)
+            delta[:, t_idx, i] = (price_b - V[:, t_idx]) / (S[:, i] * rel_bump)
+
+        # Re-hedge to q = -delta, self-financing
+        q_target = -delta[:, t_idx, :]
+        B -= np.sum((q_target - q) * S, axis=1)
+        q = q_target
+
+        dt = float(times[t_idx + 1] - times[t_idx])
+        B *= float(np.exp(market.rate * dt))
+
+        q_hist[:, t_idx, :] = q
+        cash[:, t_idx] = B
+        hedge_value[:, t_idx] = np.sum(q * S, axis=1) + B
+        hedge_value_next[:, t_idx] = np.sum(q * realised[:, t_idx + 1, :], axis=1) + B
+
+    pnl_product = np.full((n_realised, n_days), np.nan)
+    pnl_product[:, :-1] = V[:, 1:] - V[:, :-1]
+    pnl_hedge = hedge_value_next - hedge_value
+
+    return {
+        "t_idx": np.arange(n_days),
+        "time": times[:n_days].copy(),
+        "S": realised[:, :n_days, :],
+        "V_product": V,
+        "delta": delta,
+        "q": q_hist,
+        "cash": cash,
+        "hedge_value": hedge_value,
+        "hedge_value_next": hedge_value_next,
+        "pnl_product": pnl_product,
+        "pnl_hedge": pnl_hedge,
+        "pnl_total": pnl_product + pnl_hedge,
+    }
+
+
+def hedge_batch_to_frame(res: dict) -> pd.DataFrame:
+    """
+    Long-format DataFrame (one row per path and day) from run_delta_hedge_batch output,
+    with the same per-asset column names as run_delta_hedge_one_path.
+    """
+    n_realised, n_days, n_assets = res["S"].shape
+    cols = {
+        "path": np.repeat(np.arange(n_realised), n_days),
+        "t_idx": np.tile(res["t_idx"], n_realised),
+        "time": np.tile(res["time"], n_realised),
+        "V_product": res["V_product"].ravel(),
+    }
+    for i in range(n_assets):
+        cols[f"delta_{i}"] = res["delta"][:, :, i].ravel()
+    for i in range(n_assets):
+        cols[f"q{i}"] = res["q"][:, :, i].ravel()
+    cols["cash"] = res["cash"].ravel()
+    for i in range(n_assets):
+        cols[f"S{i}"] = res["S"][:, :, i].ravel()
+    for key in ("hedge_value", "hedge_value_next", "pnl_product", "pnl_hedge", "pnl_total"):
+        cols[key] = res[key].ravel()
+    return pd.DataFrame(cols)
+
+
+def hedge_error_quantiles(
+    res: dict,
+    quantiles: tuple[float, ...] = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+) -> dict:
+    """
+    Quantiles across paths of the cumulative hedged PnL (sum of daily pnl_total, NaN days skipped).
+    """
+    hedge_error = np.nansum(res["pnl_total"], axis=1)
+    return {q: float(np.quantile(hedge_error, q)) for q in quantiles}
@@ -0,0 +1,48 @@
+"""
+Content hashing of pricing inputs (dataclasses holding numpy arrays, scalars, dicts), for
+caches keyed by what was computed rather than by object identity.
+"""
+
+import dataclasses
+import hashlib
+import json
+
+import numpy as np
+
+
+def content_hash(*parts) -> str:
+    """
+    SHA-256 hex digest of the parts. Equal contents give equal hashes: arrays are hashed
+    by dtype, shape and bytes, dataclasses by class name and fields, dicts by sorted keys.
+    """
+    h = hashlib.sha256()
+    for part in parts:
+        _feed(h, part)
+    return h.hexdigest()
+
+
+def _feed(h, obj) -> None:
+    if isinstance(obj, np.ndarray):
+        arr = np.ascontiguousarray(obj)
+        h.update(f"nd:{arr.dtype.str}:{arr.shape}:".encode())
+        h.update(arr.tobytes())
+    elif dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        # a class may hash as another with the same fields (market.MarketModel as MarketParams)
+        h.update(f"dc:{getattr(type(obj), '_content_type', type(obj).__qualname__)}:".encode())
+        for field in dataclasses.fields(obj):
+            h.update(f"{field.name}=".encode())
+            _feed(h, getattr(obj, field.name))
+    elif isinstance(obj, dict):
+        h.update(b"dict:")
+        for key in sorted(obj, key=str):
+            h.update(f"{key}=".encode())
+            _feed(h, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"seq:{len(obj)}:".encode())
+        for item in obj:
+            _feed(h, item)
+    elif obj is None or isinstance(obj, (bool, int, float, str, np.generic)):
+        value = obj.item() if isinstance(obj, np.generic) else obj
+        h.update(f"{type(value).__name__}:{json.dumps(value)};".encode())
+    else:
+        raise TypeError(f"cannot hash {type(obj).__name__}")
@@ -1,6 +1,7 @@
 #vol; cor; rates
 
 from dataclasses import dataclass
+from typing import ClassVar
 import numpy as np
 
 
@@ -23,6 +24,135 @@ class MarketParams:
             raise ValueError("corr must be symmetric")
 
 
+@dataclass(frozen=True)
+class MarketModel(MarketParams):
+    """
+    MarketParams compiled for repeated simulation: validated once, with the Cholesky factor
+    of corr and the per-jump drift / diffusion constants cached. A corr that is not positive
+    definite raises numpy.linalg.LinAlgError, as an uncompiled simulation would; only
+    with_corr(..., repair=True) (stress scenarios) replaces it by the nearest correlation matrix.
+
+    Derived markets (with_vols, with_corr, with_rate) skip the validation and keep whatever
+    cached data still applies. A MarketModel can be passed anywhere a MarketParams is
+    expected and has the same content hash as the MarketParams of its fields.
+    """
+    _content_type: ClassVar[str] = "MarketParams"     # see keys.content_hash
+
+    def __post_init__(self):
+        super().__post_init__()
+        object.__setattr__(self, "vols", np.asarray(self.vols, dtype=float))
+        corr, chol = _factorise(np.asarray(self.corr, dtype=float))
+        object.__setattr__(self, "corr", corr)
+        object.__setattr__(self, "chol", chol)
+        object.__setattr__(self, "_jump_cache", {})
+
+    def with_vols(self, vols: np.ndarray) -> "MarketModel":
+        vols = np.asarray(vols, dtype=float)
+        if vols.shape != self.vols.shape:
+            raise ValueError("vols must have shape (n_assets,)")
+        if np.any(vols <= 0):
+            raise ValueError("vols must be positive")
+        return self._derive(vols=vols)
+
+    def with_corr(self, corr: np.ndarray, repair: bool = False) -> "MarketModel":
+        """
+        Market with corr replaced (symmetrised, unit diagonal). If it is not positive definite
+        it is repaired to the nearest correlation matrix when repair=True; otherwise
+        numpy.linalg.LinAlgError is raised.
+        """
+        corr = np.asarray(corr, dtype=float)
+        if corr.shape != self.corr.shape:
+            raise ValueError("corr must have shape (n_assets, n_assets)")
+        corr = 0.5 * (corr + corr.T)
+        np.fill_diagonal(corr, 1.0)
+        corr, chol = _factorise(corr, repair)
+        return self._derive(corr=corr, chol=chol)
+
+    def with_rate(self, rate: float) -> "MarketModel":
+        return self._derive(rate=float(rate))
+
+    def jump_constants(self, jump_dt: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (diffusion, drift), each of shape (n_jumps, n_assets), for the jump lengths jump_dt:
+        vols * sqrt(dt) and (r - vols^2 / 2) * dt. Cached per jump_dt.
+        """
+        jump_dt = np.asarray(jump_dt, dtype=float)
+        key = jump_dt.tobytes()
+        cached = self._jump_cache.get(key)
+        if cached is None:
+            if len(self._jump_cache) >= 64:
+                self._jump_cache.clear()
+            cached = _jump_constants(float(self.rate), self.vols, jump_dt)
+            for arr in cached:
+                arr.setflags(write=False)
+            self._jump_cache[key] = cached
+        return cached
+
+    def _derive(self, rate=None, vols=None, corr=None, chol=None) -> "MarketModel":
+        model = object.__new__(type(self))
+        object.__setattr__(model, "rate", self.rate if rate is None else rate)
+        object.__setattr__(model, "vols", self.vols if vols is None else vols)
+        object.__setattr__(model, "corr", self.corr if corr is None else corr)
+        object.__setattr__(model, "chol", self.chol if chol is None else chol)
+        # the jump constants depend on rate and vols only
+        object.__setattr__(model, "_jump_cache", self._jump_cache if rate is None and vols is None else {})
+        return model
+
+def compile_market(market: MarketParams) -> MarketModel:
+    """
+    MarketModel of market (market itself if it already is one).
+    """
+    if isinstance(market, MarketModel):
+        return market
+    return MarketModel(rate=market.rate, vols=market.vols, corr=market.corr)
+
+def cholesky_factor(market: MarketParams) -> np.ndarray:
+    """
+    Lower Cholesky factor of market.corr, cached for a MarketModel.
+    """
+    if isinstance(market, MarketModel):
+        return market.chol
+    return np.linalg.cholesky(market.corr)
+
+def jump_constants(market: MarketParams, jump_dt: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (diffusion, drift) per jump and asset (see MarketModel.jump_constants), cached for a MarketModel.
+    """
+    if isinstance(market, MarketModel):
+        return market.jump_constants(jump_dt)
+    return _jump_constants(float(market.rate), np.asarray(market.vols, dtype=float), np.asarray(jump_dt, dtype=float))
+
+def nearest_correlation(corr: np.ndarray, min_eigenvalue: float = 1e-8) -> np.ndarray:
+    """
+    Positive definite correlation matrix close to corr: eigenvalues clipped at min_eigenvalue,
+    then rescaled to a unit diagonal.
+    """
+    corr = 0.5 * (np.asarray(corr, dtype=float) + np.asarray(corr, dtype=float).T)
+    eigvals, eigvecs = np.linalg.eigh(corr)
+    clipped = (eigvecs * np.maximum(eigvals, min_eigenvalue)) @ eigvecs.T
+    scale = 1.0 / np.sqrt(np.diag(clipped))
+    repaired = clipped * scale[:, None] * scale[None, :]
+    repaired = 0.5 * (repaired + repaired.T)
+    np.fill_diagonal(repaired, 1.0)
+    return repaired
+
+def _factorise(corr: np.ndarray, repair: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    # (corr, cholesky factor); with repair, a corr that is not positive definite is first
+    # replaced by its nearest correlation matrix, otherwise the LinAlgError propagates
+    try:
+        return corr, np.linalg.cholesky(corr)
+    except np.linalg.LinAlgError:
+        if not repair:
+            raise
+        corr = nearest_correlation(corr)
+        return corr, np.linalg.cholesky(corr)
+
+def _jump_constants(rate: float, vols: np.ndarray, jump_dt: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    diffusion = vols[None, :] * np.sqrt(jump_dt)[:, None]
+    drift = (rate - 0.5 * vols**2)[None, :] * jump_dt[:, None]
+    return diffusion, drift
+
+
 @dataclass(frozen=True)
 class TimeGrid:
     times: np.ndarray            # shape (n_steps,)
@@ -83,6 +213,23 @@ def obs_times_to_indices(grid: TimeGrid, obs_times: np.ndarray) -> np.ndarray:
 
     return idx.astype(int)
 
+def sparse_grid_indices(grid: TimeGrid, obs_indices: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Grid indices a payoff actually reads: start, observation dates and maturity.
+
+    Returns:
+        sim_indices: sorted unique grid indices, starting at 0 and ending at the last grid point
+        obs_positions: position of each observation index inside sim_indices
+    """
+    obs_indices = np.asarray(obs_indices, dtype=int)
+    last = len(grid.times) - 1
+    if np.any(obs_indices < 0) or np.any(obs_indices > last):
+        raise ValueError("obs_indices must lie within the grid")
+
+    sim_indices = np.unique(np.concatenate(([0], obs_indices, [last])))
+    obs_positions = np.searchsorted(sim_indices, obs_indices)
+    return sim_indices.astype(int), obs_positions.astype(int)
+
 def make_remaining_grid(full_grid: TimeGrid, t_idx: int) -> TimeGrid:
     """
     Builds a TimeGrid for remaining time from index t_idx to end, shifted so it starts at 0.
@@ -0,0 +1,63 @@
+"""
+Running Monte Carlo statistics, so paths can be reduced chunk by chunk.
+"""
+
+from dataclasses import dataclass
+import numpy as np
+
+
+@dataclass
+class RunningStats:
+    n: int = 0                  # number of paths seen
+    mean: float = 0.0           # running mean of discounted payoffs
+    m2: float = 0.0             # sum of squared deviations from the mean
+    call_count: int = 0         # paths redeemed before maturity
+    sum_tau: float = 0.0        # sum of redemption times
+
+    def update(self, disc_payoffs: np.ndarray, taus: np.ndarray, call_count: int) -> None:
+        """
+        Fold one chunk of paths into the running sums.
+        """
+        n_b = int(disc_payoffs.shape[0])
+        if n_b == 0:
+            return
+        mean_b = float(np.mean(disc_payoffs))
+        m2_b = float(np.sum((disc_payoffs - mean_b) ** 2))
+        self.merge(RunningStats(n_b, mean_b, m2_b, int(call_count), float(np.sum(taus))))
+
+    def merge(self, other: "RunningStats") -> None:
+        """
+        Combine with statistics from another set of paths (Chan et al. pairwise update).
+        """
+        if other.n == 0:
+            return
+        if self.n == 0:
+            self.n, self.mean, self.m2 = other.n, other.mean, other.m2
+            self.call_count, self.sum_tau = other.call_count, other.sum_tau
+            return
+
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta**2 * self.n * other.n / n
+        self.n = n
+        self.call_count += other.call_count
+        self.sum_tau += other.sum_tau
+
+    @property
+    def std(self) -> float:
+        if self.n < 2:
+            return float("nan")
+        return float(np.sqrt(self.m2 / (self.n - 1)))
+
+    def to_diagnostics(self) -> dict:
+        """
+        Same keys as the diagnostics dict of price_autocallable_mc.
+        """
+        return {
+            "n_paths": self.n,
+            "call_probability": self.call_count / self.n,
+            "avg_tau": self.sum_tau / self.n,
+            "avg_discounted_payoff": self.mean,
+            "std_discounted_payoff": self.std,
+        }
@@ -0,0 +1,75 @@
+"""
+In-process memoization of pricing results.
+
+MarketParams, TimeGrid and AutocallableWorstOf hold numpy arrays and so are not hashable;
+canonical_key turns them (and levels, indices, seeds...) into a stable string key from their
+contents. PricingMemo is a bounded LRU map from such keys to results, with hit/miss counts.
+
+Results are stored as returned: treat memoized arrays as read-only.
+"""
+
+from collections import OrderedDict
+
+from desk_sim.keys import content_hash
+
+
+def canonical_key(*parts) -> str:
+    """
+    Stable key for pricing inputs: equal contents (not identities) give equal keys.
+    Parts may be the repo's dataclasses, numpy arrays, scalars, strings, tuples or dicts.
+    """
+    return content_hash(*parts)
+
+
+class PricingMemo:
+    def __init__(self, maxsize: int = 4096):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be > 0")
+        self.maxsize = int(maxsize)
+        self.hits = 0
+        self.misses = 0
+        self._store = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def get_or_compute(self, key: str, compute):
+        """
+        Memoized value for key, calling compute() on a miss. Least recently used entries
+        are dropped beyond maxsize.
+        """
+        if key in self._store:
+            self.hits += 1
+            self._store.move_to_end(key)
+            return self._store[key]
+
+        self.misses += 1
+        value = compute()
+        self._store[key] = value
+        if len(self._store) > self.maxsize:
+            self._store.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        self._store.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._store),
+            "maxsize": self.maxsize,
+        }
+
+
+def memoized(memo: PricingMemo | None, compute, *key_parts):
+    """
+    compute() through memo under canonical_key(*key_parts); compute() itself if memo is None.
+    """
+    if memo is None:
+        return compute()
+    return memo.get_or_compute(canonical_key(*key_parts), compute)
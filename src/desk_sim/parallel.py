@@ -0,0 +1,210 @@
+"""
+Multi-process Monte Carlo: split n_paths across a process pool, one independent
+SeedSequence child stream per worker, then merge the partial results.
+
+For a given root seed and worker count the results are deterministic.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from desk_sim.instruments import AutocallableWorstOf
+from desk_sim.market import MarketParams, TimeGrid
+from desk_sim.mc_stats import RunningStats
+from desk_sim.pricer_mc import _price_stats
+from desk_sim.roll_pricer import price_from_state_mc
+from desk_sim.roll_greeks import delta_from_state_fd
+from desk_sim.greeks import delta_fd, vega_fd
+
+
+def split_paths(n_paths: int, n_workers: int) -> list[int]:
+    """
+    Split n_paths into n_workers near-equal positive counts (fewer workers if n_paths is small).
+    """
+    if n_paths <= 0:
+        raise ValueError("n_paths must be > 0")
+    if n_workers <= 0:
+        raise ValueError("n_workers must be > 0")
+    n_workers = min(n_workers, n_paths)
+    base, extra = divmod(n_paths, n_workers)
+    return [base + (1 if w < extra else 0) for w in range(n_workers)]
+
+
+def spawn_seeds(root_seed: int | np.random.SeedSequence, n_workers: int) -> list[np.random.SeedSequence]:
+    """
+    Independent child seed sequences, one per worker.
+    """
+    if not isinstance(root_seed, np.random.SeedSequence):
+        root_seed = np.random.SeedSequence(root_seed)
+    return root_seed.spawn(n_workers)
+
+
+def _run(worker, tasks: list[tuple], n_workers: int) -> list:
+    """
+    Run worker over tasks, in a process pool when there is more than one task.
+    Results come back in task order.
+    """
+    if len(tasks) == 1 or n_workers == 1:
+        return [worker(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        return list(pool.map(worker, tasks))
+
+
+def _weighted_mean(values: list, counts: list[int]):
+    counts = np.asarray(counts, dtype=float)
+    return sum(w * v for w, v in zip(counts / counts.sum(), values))
+
+
+def _plan(n_paths: int, seed, n_workers: int | None) -> tuple[list[int], list[np.random.SeedSequence], int]:
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    counts = split_paths(n_paths, n_workers)
+    return counts, spawn_seeds(seed, len(counts)), len(counts)
+
+
+# ---------- workers (module level so they can be pickled) ----------
+
+def _price_worker(task) -> RunningStats:
+    product, market, grid, n_paths, seed, sparse_grid, chunk_size = task
+    return _price_stats(product, market, grid, n_paths, np.random.default_rng(seed), sparse_grid, chunk_size)
+
+
+def _price_from_state_worker(task) -> float:
+    product, market, grid, level_now, obs_idx, n_paths, seed, sparse_grid = task
+    return price_from_state_mc(
+        product, market, grid, level_now, obs_idx, n_paths,
+        rng=np.random.default_rng(seed), sparse_grid=sparse_grid,
+    )
+
+
+def _delta_from_state_worker(task) -> np.ndarray:
+    product, market, grid, level_now, obs_idx, n_paths, rel_bump, seed = task
+    return delta_from_state_fd(product, market, grid, level_now, obs_idx, n_paths, rel_bump=rel_bump, rng_seed=seed)
+
+
+def _delta_worker(task) -> np.ndarray:
+    product, market, grid, n_paths, spot0, rel_bump, seed = task
+    return delta_fd(product, market, grid, n_paths, spot0, rel_bump=rel_bump, rng_seed=seed)
+
+
+def _vega_worker(task) -> np.ndarray:
+    product, market, grid, n_paths, abs_bump, seed = task
+    return vega_fd(product, market, grid, n_paths, abs_bump=abs_bump, rng_seed=seed)
+
+
+# ---------- public API ----------
+
+def price_autocallable_mc_parallel(
+    product: AutocallableWorstOf,
+    market: MarketParams,
+    grid: TimeGrid,
+    n_paths: int,
+    seed: int | np.random.SeedSequence = 0,
+    n_workers: int | None = None,
+    return_diag: bool = False,
+    sparse_grid: bool = False,
+    chunk_size: int | None = None
+):
+    """
+    Parallel price_autocallable_mc. Each worker prices its share of the paths with its own
+    seed stream; the running statistics are merged into one price and diagnostics dict.
+
+    Returns:
+        price (float) or (price, diagnostics dict) if return_diag=True
+    """
+    counts, seeds, n_workers = _plan(n_paths, seed, n_workers)
+    tasks = [(product, market, grid, n, s, sparse_grid, chunk_size) for n, s in zip(counts, seeds)]
+
+    stats = RunningStats()
+    for part in _run(_price_worker, tasks, n_workers):
+        stats.merge(part)
+
+    price = float(stats.mean)
+    if not return_diag:
+        return price
+
+    diagnostics = stats.to_diagnostics()
+    diagnostics["n_workers"] = n_workers
+    return price, diagnostics
+
+
+def price_from_state_mc_parallel(
+    product: AutocallableWorstOf,
+    market: MarketParams,
+    grid_remaining: TimeGrid,
+    level_now: np.ndarray,
+    obs_indices_remaining: np.ndarray,
+    n_paths: int,
+    seed: int | np.random.SeedSequence = 0,
+    n_workers: int | None = None,
+    sparse_grid: bool = False
+) -> float:
+    """
+    Parallel price_from_state_mc: path-count weighted mean of the per-worker prices.
+    """
+    counts, seeds, n_workers = _plan(n_paths, seed, n_workers)
+    tasks = [
+        (product, market, grid_remaining, level_now, obs_indices_remaining, n, s, sparse_grid)
+        for n, s in zip(counts, seeds)
+    ]
+    return float(_weighted_mean(_run(_price_from_state_worker, tasks, n_workers), counts))
+
+
+def delta_from_state_fd_parallel(
+    product: AutocallableWorstOf,
+    market: MarketParams,
+    grid_remaining: TimeGrid,
+    level_now: np.ndarray,
+    obs_indices_remaining: np.ndarray,
+    n_paths: int,
+    rel_bump: float = 0.01,
+    seed: int | np.random.SeedSequence = 0,
+    n_workers: int | None = None
+) -> np.ndarray:
+    """
+    Parallel delta_from_state_fd. Each worker bumps on its own common random numbers;
+    finite differences are linear in the means, so the merge is a weighted mean.
+    """
+    counts, seeds, n_workers = _plan(n_paths, seed, n_workers)
+    tasks = [
+        (product, market, grid_remaining, level_now, obs_indices_remaining, n, rel_bump, s)
+        for n, s in zip(counts, seeds)
+    ]
+    return _weighted_mean(_run(_delta_from_state_worker, tasks, n_workers), counts)
+
+
+def delta_fd_parallel(
+    product: AutocallableWorstOf,
+    market: MarketParams,
+    grid: TimeGrid,
+    n_paths: int,
+    spot0: np.ndarray,
+    rel_bump: float = 0.01,
+    seed: int | np.random.SeedSequence = 0,
+    n_workers: int | None = None
+) -> np.ndarray:
+    """
+    Parallel delta_fd (weighted mean of the per-worker finite differences).
+    """
+    counts, seeds, n_workers = _plan(n_paths, seed, n_workers)
+    tasks = [(product, market, grid, n, spot0, rel_bump, s) for n, s in zip(counts, seeds)]
+    return _weighted_mean(_run(_delta_worker, tasks, n_workers), counts)
+
+
+def vega_fd_parallel(
+    product: AutocallableWorstOf,
+    market: MarketParams,
+    grid: TimeGrid,
+    n_paths: int,
+    abs_bump: float = 0.01,
+    seed: int | np.random.SeedSequence = 0,
+    n_workers: int | None = None
+) -> np.ndarray:
+    """
+    Parallel vega_fd (weighted mean of the per-worker finite differences).
+    """
+    counts, seeds, n_workers = _plan(n_paths, seed, n_workers)
+    tasks = [(product, market, grid, n, abs_bump, s) for n, s in zip(counts, seeds)]
+    return _weighted_mean(_run(_vega_worker, tasks, n_workers), counts)
@@ -0,0 +1,141 @@
+"""
+On-disk cache of simulated path cubes.
+
+Entries are .npy files keyed by a content hash of the market, grid, path count, simulation
+mode and the generator state before simulating (for a seeded generator: the seed). Hits are
+loaded zero-copy with np.load(mmap_mode="r"). A JSON sidecar stores the generator state after
+the simulation, restored on a hit, so later draws from the same rng are unchanged.
+
+The directory is bounded by max_bytes, evicting least recently used entries (by mtime).
+"""
+
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from desk_sim.keys import content_hash
+from desk_sim.market import MarketParams, TimeGrid
+
+
+class PathCache:
+    def __init__(self, directory: str, max_bytes: int = 2**30):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be > 0")
+        self.directory = directory
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, key: str) -> tuple[str, str]:
+        base = os.path.join(self.directory, key)
+        return base + ".npy", base + ".json"
+
+    def get(self, key: str) -> tuple[np.ndarray, dict] | None:
+        """
+        (read-only memory-mapped array, metadata) for key, or None if absent.
+        """
+        npy, meta = self._paths(key)
+        try:
+            with open(meta) as f:
+                metadata = json.load(f)
+            paths = np.load(npy, mmap_mode="r")
+        except (FileNotFoundError, ValueError):
+            return None
+        os.utime(npy)  # mark as recently used
+        return paths, metadata
+
+    def put(self, key: str, paths: np.ndarray, metadata: dict) -> None:
+        """
+        Store paths and metadata under key, then evict down to max_bytes. Arrays larger than
+        the whole budget are not stored.
+        """
+        if paths.nbytes > self.max_bytes:
+            return
+        npy, meta = self._paths(key)
+        self._write_atomic(npy, lambda f: np.save(f, paths))
+        self._write_atomic(meta, lambda f: f.write(json.dumps(metadata).encode()))
+        self.evict()
+
+    def _write_atomic(self, target: str, write) -> None:
+        # write to a temporary file and rename, so readers never see a partial entry
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, target)
+
+    def evict(self) -> None:
+        """
+        Delete least recently used entries until the .npy files fit in max_bytes.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".npy"):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime_ns, stat.st_size, name[:-4]))
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            total -= size
+
+    def clear(self) -> None:
+        for name in os.listdir(self.directory):
+            if name.endswith((".npy", ".json", ".tmp")):
+                os.remove(os.path.join(self.directory, name))
+
+    def size_bytes(self) -> int:
+        return sum(
+            os.path.getsize(os.path.join(self.directory, name))
+            for name in os.listdir(self.directory) if name.endswith(".npy")
+        )
+
+
+def cached_simulation(
+    path_cache: PathCache | None,
+    simulate,
+    grid: TimeGrid,
+    market: MarketParams,
+    n_paths: int,
+    rng: np.random.Generator,
+    **mode
+) -> np.ndarray:
+    """
+    simulate() through path_cache (simulate() itself when path_cache is None).
+    mode holds whatever else determines the paths (simulator, sim indices, sampler...).
+
+    On a hit the returned array is a read-only memmap and rng is moved to the state it
+    would have after simulate(); callers must not write to the result.
+    """
+    if path_cache is None:
+        return simulate()
+
+    key = content_hash(grid, market, n_paths, rng.bit_generator.state, mode)
+    entry = path_cache.get(key)
+    if entry is not None:
+        path_cache.hits += 1
+        paths, metadata = entry
+        rng.bit_generator.state = metadata["rng_state"]
+        return paths
+
+    path_cache.misses += 1
+    paths = simulate()
+    path_cache.put(key, paths, {"rng_state": _jsonable(rng.bit_generator.state)})
+    return paths
+
+
+def _jsonable(state):
+    if isinstance(state, dict):
+        return {k: _jsonable(v) for k, v in state.items()}
+    if isinstance(state, np.ndarray):
+        return state.tolist()
+    if isinstance(state, np.generic):
+        return state.item()
+    return state
@@ -1,8 +1,17 @@
 import numpy as np
 
-from desk_sim.instruments import AutocallableWorstOf, payoff_and_tau_from_levels
-from desk_sim.market import MarketParams, TimeGrid, obs_times_to_indices
-from desk_sim.dynamics import simulate_bs_normalised_levels
+from desk_sim.instruments import AutocallableWorstOf, payoff_and_tau_batch
+from desk_sim.market import MarketParams, TimeGrid, obs_times_to_indices, sparse_grid_indices
+from desk_sim.dynamics import (
+    simulate_bs_normalised_levels, simulate_bs_levels_at_indices, draw_normals, levels_from_normals,
+    path_buffer_view,
+)
+from desk_sim.mc_stats import RunningStats
+from desk_sim.fused import discounted_payoffs_fused
+from desk_sim.early_stop import discounted_payoffs_by_period
+from desk_sim import profiling
+from desk_sim.path_cache import PathCache, cached_simulation
+from desk_sim.variance_reduction import level_controls, control_variate_adjust, conditional_final_discounted_payoff
 
 
 def price_autocallable_mc(
@@ -11,47 +20,365 @@ def price_autocallable_mc(
     grid: TimeGrid,
     n_paths: int,
     rng: np.random.Generator | None = None,
-    return_diag: bool = False
+    return_diag: bool = False,
+    sparse_grid: bool = False,
+    chunk_size: int | None = None,
+    sampler: str = "pseudo",
+    antithetic: bool = False,
+    control_variate: bool = False,
+    conditional_final: bool = False,
+    path_cache: PathCache | None = None,
+    dtype=np.float64,
+    backend: str = "cube"
 ):
     """
     Monte Carlo price of a worst-of autocallable:
         Price = E[ exp(-r*tau) * Payoff(tau) ]
 
+    With sparse_grid=True only the observation dates and maturity are simulated
+    (exact lognormal jumps), instead of every point of the grid.
+
+    With chunk_size set, paths are simulated and reduced chunk_size at a time, so peak
+    memory is bounded by one chunk (see chunk_size_for_budget). For a given rng seed the
+    diagnostics do not depend on the chunk size (up to floating-point summation order).
+
+    sampler="sobol" uses scrambled Sobol normals with a Brownian bridge (dynamics.draw_normals)
+    instead of pseudo-random ones; see price_autocallable_rqmc for error bars.
+
+    Variance reduction (any combination; not with chunk_size):
+        antithetic: pair every path with its negated normals (n_paths even)
+        control_variate: regress out the simulated levels at the observation dates and
+            maturity, whose means are known in closed form (discounted forwards)
+        conditional_final: replace the payoff of paths alive before the final date by its
+            closed-form conditional expectation over the last asset's final normal
+    The diagnostics then also report "std_error" of the price and "variance_reduction_factor",
+    the plain-MC variance of the mean over the achieved one for the same n_paths; a target
+    standard error needs about n_paths * (std_error / target)**2 paths.
+
+    With path_cache set, simulated paths are read from / written to that on-disk cache
+    (see path_cache.PathCache); results are the same as without it. Not with variance reduction.
+
+    dtype=np.float32 simulates float32 paths (half the memory traffic) on the same normals;
+    payoffs, discounting and the mean are still accumulated in float64.
+
+    backend="fused" walks each path date by date without building the level cube and stops
+    it once it autocalls (see desk_sim.fused; compiled when numba is installed). It sees the
+    same normals as the default backend="cube", so prices agree up to rounding. Pseudo-random
+    float64 plain MC only (no variance reduction, path_cache, sobol or float32).
+
+    backend="early_stop" simulates observation period by observation period, one exact jump
+    per period (sparse_grid has no effect), and drops the paths redeemed at each date (see
+    desk_sim.early_stop); its normals differ from the cube backend's. The diagnostics then
+    also report "survival_counts" (paths alive at the start of each period),
+    "simulated_steps" (path-periods simulated), "full_steps" (path-periods of a full
+    simulation) and "work_saved" (1 - simulated_steps / full_steps). Pseudo-random plain MC only.
+
+    Under profiling.session() the diagnostics also carry "profile", the per-stage
+    timings and counts so far (see desk_sim.profiling).
+
     Returns:
         price (float) or (price, diagnostics dict) if return_diag=True
     """
     if n_paths <= 0:
         raise ValueError("n_paths must be > 0")
+    if chunk_size is not None and chunk_size <= 0:
+        raise ValueError("chunk_size must be > 0")
+    if sampler == "sobol" and chunk_size is not None:
+        raise ValueError("chunk_size is not supported with sampler='sobol'")
+    check_backend(backend, sampler, path_cache, dtype)
+    if backend != "cube" and (antithetic or control_variate or conditional_final):
+        raise ValueError(f"backend={backend!r} does not support variance reduction")
     if rng is None:
         rng = np.random.default_rng()
 
-    # 1) simulate normalised levels
-    paths = simulate_bs_normalised_levels(grid=grid, market=market, n_paths=n_paths, rng=rng)
-    # paths shape: (n_paths, n_steps, n_assets)
+    if antithetic or control_variate or conditional_final:
+        if chunk_size is not None:
+            raise ValueError("variance reduction is not supported with chunk_size")
+        if path_cache is not None:
+            raise ValueError("variance reduction is not supported with path_cache")
+        with profiling.stage("price_autocallable_mc", paths=n_paths):
+            price, diagnostics = _price_variance_reduced(
+                product, market, grid, n_paths, rng, sparse_grid, sampler,
+                antithetic, control_variate, conditional_final, dtype,
+            )
+        if profiling.is_enabled():
+            diagnostics["profile"] = profiling.report()
+        return (price, diagnostics) if return_diag else price
+
+    work = {} if backend == "early_stop" else None
+    with profiling.stage("price_autocallable_mc", paths=n_paths):
+        stats = _price_stats(product, market, grid, n_paths, rng, sparse_grid, chunk_size, sampler, path_cache,
+                             dtype, backend, work)
+    price = float(stats.mean)
+
+    if not return_diag:
+        return price
+
+    diagnostics = stats.to_diagnostics()
+    if work is not None:
+        full_steps = n_paths * work["survival_counts"].shape[0]
+        diagnostics.update(work)
+        diagnostics["full_steps"] = full_steps
+        diagnostics["work_saved"] = 1.0 - work["simulated_steps"] / full_steps if full_steps > 0 else 0.0
+    if profiling.is_enabled():
+        diagnostics["profile"] = profiling.report()
+    return price, diagnostics
+
 
-    # 2) map observation times to indices
+def price_autocallable_rqmc(
+    product: AutocallableWorstOf,
+    market: MarketParams,
+    grid: TimeGrid,
+    n_paths: int,
+    n_replicates: int = 16,
+    rng: np.random.Generator | None = None,
+    sparse_grid: bool = True
+):
+    """
+    Randomised quasi-Monte Carlo price: n_replicates independently scrambled Sobol sets of
+    n_paths each (n_paths should be a power of 2). The spread of the replicate prices gives
+    the standard error, which plain QMC cannot.
+
+    Returns:
+        (price, diagnostics dict) with "n_paths" (total), "n_replicates", "std_error",
+        "replicate_prices"
+    """
+    if n_replicates < 2:
+        raise ValueError("n_replicates must be >= 2")
+    if rng is None:
+        rng = np.random.default_rng()
+
+    prices = np.array([
+        price_autocallable_mc(product, market, grid, n_paths, rng=rng, sparse_grid=sparse_grid, sampler="sobol")
+        for _ in range(n_replicates)
+    ])
+    price = float(np.mean(prices))
+    diagnostics = {
+        "n_paths": n_paths * n_replicates,
+        "n_replicates": n_replicates,
+        "std_error": float(np.std(prices, ddof=1) / np.sqrt(n_replicates)),
+        "replicate_prices": prices,
+    }
+    return price, diagnostics
+
+
+def chunk_size_for_budget(n_dates: int, n_assets: int, memory_budget_bytes: int, dtype=np.float64) -> int:
+    """
+    Number of paths per chunk so that one chunk stays within memory_budget_bytes.
+
+    Counts the float64 normals, the levels and one temporary of the same size in dtype.
+    """
+    if memory_budget_bytes <= 0:
+        raise ValueError("memory_budget_bytes must be > 0")
+    bytes_per_path = n_dates * n_assets * (np.dtype(float).itemsize + 2 * np.dtype(dtype).itemsize)
+    return max(1, int(memory_budget_bytes // bytes_per_path))
+
+
+def _price_stats(
+    product: AutocallableWorstOf,
+    market: MarketParams,
+    grid: TimeGrid,
+    n_paths: int,
+    rng: np.random.Generator,
+    sparse_grid: bool = False,
+    chunk_size: int | None = None,
+    sampler: str = "pseudo",
+    path_cache: PathCache | None = None,
+    dtype=np.float64,
+    backend: str = "cube",
+    work: dict | None = None
+) -> RunningStats:
+    """
+    Running statistics of the discounted payoff over n_paths, simulated chunk by chunk.
+    With backend="early_stop", work accumulates the survival counts and simulated steps.
+    """
+    # 1) map observation times to indices (early_stop always jumps from date to date)
     obs_idx = obs_times_to_indices(grid, product.obs_times)
+    sim_idx = None
+    if sparse_grid and backend != "early_stop":
+        sim_idx, obs_idx = sparse_grid_indices(grid, obs_idx)
 
-    # 3) compute discounted payoffs path-by-path
-    r = float(market.rate)
-    disc_payoffs = np.empty(n_paths, dtype=float)
+    # 2) simulate and reduce chunk by chunk (a single chunk by default)
+    chunk = n_paths if chunk_size is None else int(chunk_size)
+    stats = RunningStats()
+    for start in range(0, n_paths, chunk):
+        n_chunk = min(chunk, n_paths - start)
+        disc_payoffs, taus, call_count = _discounted_payoffs_chunk(
+            product, market, grid, n_chunk, rng, obs_idx, sim_idx, sampler, path_cache, dtype, backend, work
+        )
+        stats.update(disc_payoffs, taus, call_count)
+    return stats
 
-    call_count = 0
-    taus = np.empty(n_paths, dtype=float)
 
-    for p in range(n_paths):
-        payoff, tau = payoff_and_tau_from_levels(product, paths[p], obs_idx)
-        taus[p] = tau
-        disc_payoffs[p] = np.exp(-r * tau) * payoff
+def _discounted_payoffs_chunk(
+    product: AutocallableWorstOf,
+    market: MarketParams,
+    grid: TimeGrid,
+    n_paths: int,
+    rng: np.random.Generator,
+    obs_idx: np.ndarray,
+    sim_idx: np.ndarray | None,
+    sampler: str = "pseudo",
+    path_cache: PathCache | None = None,
+    dtype=np.float64,
+    backend: str = "cube",
+    work: dict | None = None
+) -> tuple[np.ndarray, np.ndarray, int]:
+    """
+    Simulate one chunk of paths and return (discounted payoffs, taus, number of autocalls).
+    obs_idx indexes into the simulated dates (sparse positions when sim_idx is given).
+    """
+    if backend == "fused":
+        disc_payoffs, taus = discounted_payoffs_fused(product, market, grid, n_paths, rng, obs_idx, sim_idx)
+    elif backend == "early_stop":
+        disc_payoffs, taus, survival, steps = discounted_payoffs_by_period(
+            product, market, grid, n_paths, rng, obs_idx, dtype=dtype
+        )
+        if work is not None:
+            work["survival_counts"] = work.get("survival_counts", 0) + survival
+            work["simulated_steps"] = work.get("simulated_steps", 0) + steps
+    else:
+        paths = simulate_paths(grid, market, n_paths, rng, sim_idx, sampler, path_cache, dtype)
+        # paths shape: (n_paths, n_dates, n_assets), obs_idx indexes into axis 1
 
-        # autocall if tau < maturity (by construction in TP1)
-        if tau < product.maturity - 1e-15:
-            call_count += 1
+        r = float(market.rate)
+        payoffs, taus = payoff_and_tau_batch(product, paths, obs_idx)
+        disc_payoffs = np.exp(-r * taus) * payoffs
 
-    price = float(np.mean(disc_payoffs))
+    # autocall if tau < maturity (by construction in TP1)
+    call_count = int(np.count_nonzero(taus < product.maturity - 1e-15))
 
-    if not return_diag:
-        return price
+    return disc_payoffs, taus, call_count
+
+
+def check_backend(backend: str, sampler: str, path_cache: PathCache | None, dtype) -> None:
+    """
+    Raise ValueError unless backend ("cube", "fused" or "early_stop") supports the other
+    options; shared by every pricer that takes a backend.
+    """
+    if backend not in ("cube", "fused", "early_stop"):
+        raise ValueError("backend must be 'cube', 'fused' or 'early_stop'")
+    if backend != "cube":
+        if sampler != "pseudo":
+            raise ValueError(f"backend={backend!r} supports sampler='pseudo' only")
+        if path_cache is not None:
+            raise ValueError(f"backend={backend!r} does not store paths, so path_cache is not supported")
+    if backend == "fused" and np.dtype(dtype) != np.float64:
+        raise ValueError("backend='fused' runs in float64 only")
+
+
+def simulate_paths(
+    grid: TimeGrid,
+    market: MarketParams,
+    n_paths: int,
+    rng: np.random.Generator,
+    sim_idx: np.ndarray | None = None,
+    sampler: str = "pseudo",
+    path_cache: PathCache | None = None,
+    dtype=np.float64,
+    path_buffer: np.ndarray | None = None,
+    normals_buffer: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Paths in dtype on the dates sim_idx (every grid date if None), through path_cache if given.
+    The result may be a read-only memmap when it comes from the cache.
+
+    path_buffer: optional contiguous scratch array (dtype, at least as many elements as the
+    cube) the paths are written into instead of a new allocation; the result is then a view
+    of it, valid until the buffer is reused.
+    normals_buffer: likewise for the normals (pseudo sampler), at least n_paths * (n_dates - 1)
+    * n_assets elements, so repeated calls allocate nothing cube-sized.
+    """
+    n_dates = grid.times.shape[0] if sim_idx is None else len(sim_idx)
+    n_assets = market.vols.shape[0]
+    out = None
+    if path_buffer is not None:
+        out = path_buffer_view(path_buffer, (n_paths, n_dates, n_assets), dtype)
+    normals_out = None
+    if normals_buffer is not None and sampler == "pseudo":
+        normals_out = path_buffer_view(normals_buffer, (n_paths, n_dates - 1, n_assets), dtype)
+
+    if sim_idx is not None:
+        def simulate():
+            return simulate_bs_levels_at_indices(grid, market, n_paths, sim_idx, rng=rng, sampler=sampler,
+                                                 dtype=dtype, out=out, normals_out=normals_out)
+    elif sampler != "pseudo":
+        all_idx = np.arange(grid.times.shape[0])
+
+        def simulate():
+            return simulate_bs_levels_at_indices(grid, market, n_paths, all_idx, rng=rng, sampler=sampler,
+                                                 dtype=dtype, out=out)
+    else:
+        def simulate():
+            return simulate_bs_normalised_levels(grid=grid, market=market, n_paths=n_paths, rng=rng,
+                                                 dtype=dtype, out=out, normals_out=normals_out)
+
+    return cached_simulation(path_cache, simulate, grid, market, n_paths, rng,
+                             sim_idx=sim_idx, sampler=sampler, dtype=np.dtype(dtype).name)
+
+
+def _price_variance_reduced(
+    product: AutocallableWorstOf,
+    market: MarketParams,
+    grid: TimeGrid,
+    n_paths: int,
+    rng: np.random.Generator,
+    sparse_grid: bool,
+    sampler: str,
+    antithetic: bool,
+    control_variate: bool,
+    conditional_final: bool,
+    dtype=np.float64
+) -> tuple[float, dict]:
+    """
+    Price with the requested variance-reduction modes combined, plus diagnostics.
+    """
+    obs_idx = obs_times_to_indices(grid, product.obs_times)
+    if sparse_grid:
+        sim_idx, obs_pos = sparse_grid_indices(grid, obs_idx)
+    else:
+        sim_idx, obs_pos = np.arange(grid.times.shape[0]), obs_idx
+
+    n_assets = market.vols.shape[0]
+    Z = draw_normals(grid, sim_idx, n_paths, n_assets, rng, sampler=sampler, antithetic=antithetic)
+    paths = levels_from_normals(grid, market, Z, sim_idx, dtype=dtype)
+
+    r = float(market.rate)
+    payoffs, taus = payoff_and_tau_batch(product, paths, obs_pos)
+    disc_payoffs = np.exp(-r * taus) * payoffs
+    call_count = int(np.count_nonzero(taus < product.maturity - 1e-15))
+
+    y = disc_payoffs
+    last = paths.shape[1] - 1
+    if conditional_final and last > 0:
+        early_obs = obs_pos[obs_pos < last]
+        if early_obs.size > 0:
+            alive = ~np.any(np.min(paths[:, early_obs, :], axis=2) >= product.autocall_barrier, axis=1)
+        else:
+            alive = np.ones(n_paths, dtype=bool)
+        final_is_obs = bool(obs_pos.size > 0 and obs_pos[-1] == last)
+        tau_final_obs = float(product.obs_times[obs_pos.size - 1]) if final_is_obs else product.maturity
+        last_jump_dt = float(grid.dt) * float(sim_idx[-1] - sim_idx[-2])
+        cond = conditional_final_discounted_payoff(
+            product, market, paths, Z[:, -1, :], last_jump_dt, final_is_obs, tau_final_obs
+        )
+        y = np.where(alive, cond, y)
+
+    if control_variate:
+        positions = np.unique(np.concatenate((obs_pos, [last])))
+        positions = positions[positions > 0]
+        controls, means = level_controls(paths, positions, sim_idx[positions], market, float(grid.dt))
+        y = control_variate_adjust(y, controls, means)
+
+    if antithetic:
+        half = n_paths // 2
+        units = 0.5 * (y[:half] + y[half:])
+    else:
+        units = y
+
+    price = float(np.mean(units))
+    std_error = float(np.std(units, ddof=1) / np.sqrt(units.shape[0]))
+    plain_var_of_mean = float(np.var(disc_payoffs, ddof=1)) / n_paths
 
     diagnostics = {
         "n_paths": n_paths,
@@ -59,5 +386,7 @@ def price_autocallable_mc(
         "avg_tau": float(np.mean(taus)),
         "avg_discounted_payoff": float(np.mean(disc_payoffs)),
         "std_discounted_payoff": float(np.std(disc_payoffs, ddof=1)),
+        "std_error": std_error,
+        "variance_reduction_factor": plain_var_of_mean / std_error**2 if std_error > 0 else float("inf"),
     }
     return price, diagnostics
@@ -0,0 +1,135 @@
+"""
+Opt-in instrumentation of the Monte Carlo hot paths: per-stage wall time, call counts,
+paths processed and bytes allocated.
+
+Disabled by default. A disabled stage() returns a shared no-op context manager, so the
+hooks cost one global check per call. State is per process: parallel workers keep their
+own totals.
+
+    with profiling.session():
+        price, diag = price_autocallable_mc(..., return_diag=True)
+    diag["profile"]            # also profiling.report() / profiling.format_report()
+"""
+
+from contextlib import contextmanager
+import time
+
+_enabled = False
+_stats: dict[str, dict] = {}
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add(self, paths: int = 0, nbytes: int = 0) -> None:
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("name", "paths", "nbytes", "start")
+
+    def __init__(self, name: str, paths: int, nbytes: int):
+        self.name = name
+        self.paths = paths
+        self.nbytes = nbytes
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _record(self.name, time.perf_counter() - self.start, self.paths, self.nbytes)
+        return False
+
+    def add(self, paths: int = 0, nbytes: int = 0) -> None:
+        """
+        Count paths / bytes known only inside the block (e.g. the size of an array it allocated).
+        """
+        self.paths += int(paths)
+        self.nbytes += int(nbytes)
+
+
+def stage(name: str, paths: int = 0, nbytes: int = 0):
+    """
+    Context manager timing one execution of stage name (no-op when disabled).
+    """
+    if not _enabled:
+        return _NULL_STAGE
+    return _Stage(name, int(paths), int(nbytes))
+
+
+def count(name: str, paths: int = 0, nbytes: int = 0) -> None:
+    """
+    Add a call, paths and bytes to stage name without timing (no-op when disabled).
+    """
+    if _enabled:
+        _record(name, 0.0, int(paths), int(nbytes))
+
+
+def _record(name: str, seconds: float, paths: int, nbytes: int) -> None:
+    entry = _stats.get(name)
+    if entry is None:
+        entry = _stats[name] = {"time": 0.0, "calls": 0, "paths": 0, "bytes": 0}
+    entry["time"] += seconds
+    entry["calls"] += 1
+    entry["paths"] += paths
+    entry["bytes"] += nbytes
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    _stats.clear()
+
+
+@contextmanager
+def session(reset_stats: bool = True):
+    """
+    Enable instrumentation for the block (clearing previous totals unless reset_stats=False),
+    restoring the previous on/off state afterwards.
+    """
+    was_enabled = _enabled
+    if reset_stats:
+        reset()
+    enable()
+    try:
+        yield
+    finally:
+        if not was_enabled:
+            disable()
+
+
+def report() -> dict:
+    """
+    Copy of the per-stage totals: {stage: {"time", "calls", "paths", "bytes"}}.
+    """
+    return {name: dict(entry) for name, entry in sorted(_stats.items())}
+
+
+def format_report() -> str:
+    lines = [f"{'stage':40s} {'time [s]':>10s} {'calls':>8s} {'paths':>12s} {'MiB':>9s}"]
+    for name, entry in sorted(_stats.items(), key=lambda item: -item[1]["time"]):
+        lines.append(
+            f"{name:40s} {entry['time']:10.4f} {entry['calls']:8d} {entry['paths']:12d} "
+            f"{entry['bytes'] / 2**20:9.1f}"
+        )
+    return "\n".join(lines)
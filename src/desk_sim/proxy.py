@@ -0,0 +1,189 @@
+"""
+Offline regression proxy for the autocallable price and delta along a time grid.
+
+Longstaff-Schwartz style: simulate paths from dispersed initial levels, and for every
+grid date regress the realised discounted remaining payoff on polynomial features of the
+current levels. The fitted polynomial is the conditional expectation, i.e. the price;
+its gradient is the delta. Lookups are O(1) per date, with no nested Monte Carlo.
+"""
+
+from dataclasses import dataclass
+import numpy as np
+
+from desk_sim.instruments import AutocallableWorstOf, payoff_and_tau_batch
+from desk_sim.market import MarketParams, TimeGrid
+from desk_sim.dynamics import simulate_bs_normalised_levels
+from desk_sim.roll_pricer import price_from_state_mc, relative_paths_from_master, remaining_product
+
+
+@dataclass(frozen=True)
+class RegressionProxy:
+    times: np.ndarray            # shape (n_nodes,), grid times of the fitted dates
+    coefs: np.ndarray            # shape (n_nodes, n_features)
+    degree: int                  # polynomial degree of the features
+    n_assets: int
+
+    def __post_init__(self):
+        if self.coefs.shape != (self.times.shape[0], _n_features(self.n_assets, self.degree)):
+            raise ValueError("coefs must have shape (n_nodes, n_features)")
+
+    def price(self, t_idx: int, level_now: np.ndarray) -> float:
+        """
+        Proxy price at grid date t_idx and normalised levels level_now (n_assets,).
+        """
+        return float(_features(np.atleast_2d(level_now), self.degree)[0] @ self.coefs[t_idx])
+
+    def delta(self, t_idx: int, level_now: np.ndarray) -> np.ndarray:
+        """
+        Proxy delta per asset (gradient of the fitted polynomial), shape (n_assets,).
+        """
+        grads = _feature_gradients(np.atleast_2d(level_now), self.degree)[0]  # (n_assets, n_features)
+        return grads @ self.coefs[t_idx]
+
+    def save(self, path: str) -> None:
+        np.savez(path, times=self.times, coefs=self.coefs, degree=self.degree, n_assets=self.n_assets)
+
+    @classmethod
+    def load(cls, path: str) -> "RegressionProxy":
+        with np.load(path) as data:
+            return cls(
+                times=data["times"],
+                coefs=data["coefs"],
+                degree=int(data["degree"]),
+                n_assets=int(data["n_assets"]),
+            )
+
+
+def build_regression_proxy(
+    product: AutocallableWorstOf,
+    market: MarketParams,
+    full_grid: TimeGrid,
+    n_paths: int = 20000,
+    degree: int = 4,
+    level_dispersion: float = 0.1,
+    rng_seed: int = 0
+) -> RegressionProxy:
+    """
+    Fit one regression per grid date (all dates but maturity) of the discounted remaining payoff
+    on features of the current levels.
+
+    Initial levels are drawn lognormally with log-std level_dispersion around 1, so even the
+    first dates see a spread of states to regress on. A wider spread covers more states but
+    fits each one less tightly; check the result with proxy_error_vs_mc.
+    """
+    if n_paths <= 0:
+        raise ValueError("n_paths must be > 0")
+    if degree < 1:
+        raise ValueError("degree must be >= 1")
+    if level_dispersion <= 0:
+        raise ValueError("level_dispersion must be > 0")
+
+    n_assets = market.vols.shape[0]
+    rng = np.random.default_rng(rng_seed)
+    master = simulate_bs_normalised_levels(full_grid, market, n_paths, rng=rng)
+    x0 = np.exp(level_dispersion * rng.standard_normal(size=(n_paths, n_assets)))
+
+    r = float(market.rate)
+    n_nodes = full_grid.times.shape[0] - 1
+    coefs = np.empty((n_nodes, _n_features(n_assets, degree)), dtype=float)
+
+    for t_idx in range(n_nodes):
+        product_rem, _, obs_idx = remaining_product(product, full_grid, t_idx)
+        paths_rel, obs_pos = relative_paths_from_master(master, t_idx, obs_idx)
+
+        state = x0 * master[:, t_idx, :]
+        payoffs, taus = payoff_and_tau_batch(product_rem, paths_rel * state[:, None, :], obs_pos)
+        target = np.exp(-r * taus) * payoffs
+
+        coefs[t_idx], *_ = np.linalg.lstsq(_features(state, degree), target, rcond=None)
+
+    return RegressionProxy(times=full_grid.times[:n_nodes].copy(), coefs=coefs, degree=degree, n_assets=n_assets)
+
+
+def proxy_error_vs_mc(
+    proxy: RegressionProxy,
+    product: AutocallableWorstOf,
+    market: MarketParams,
+    full_grid: TimeGrid,
+    t_indices: np.ndarray,       # shape (n_states,)
+    levels: np.ndarray,          # shape (n_states, n_assets)
+    n_paths: int = 20000,
+    rng_seed: int = 0
+) -> dict:
+    """
+    Compare proxy prices with full Monte Carlo (price_from_state_mc) at the given states.
+
+    Returns:
+        dict with "proxy", "mc", "errors" (proxy - mc), "max_abs_error", "mean_abs_error"
+    """
+    t_indices = np.asarray(t_indices, dtype=int)
+    levels = np.atleast_2d(np.asarray(levels, dtype=float))
+    if levels.shape[0] != t_indices.shape[0]:
+        raise ValueError("need one level vector per t_index")
+
+    proxy_prices = np.empty(t_indices.shape[0], dtype=float)
+    mc_prices = np.empty(t_indices.shape[0], dtype=float)
+    for k, (t_idx, level_now) in enumerate(zip(t_indices, levels)):
+        product_rem, rem_grid, obs_idx = remaining_product(product, full_grid, int(t_idx))
+        proxy_prices[k] = proxy.price(int(t_idx), level_now)
+        mc_prices[k] = price_from_state_mc(
+            product_rem, market, rem_grid, level_now, obs_idx, n_paths,
+            rng=np.random.default_rng(rng_seed + k), sparse_grid=True,
+        )
+
+    errors = proxy_prices - mc_prices
+    return {
+        "proxy": proxy_prices,
+        "mc": mc_prices,
+        "errors": errors,
+        "max_abs_error": float(np.max(np.abs(errors))),
+        "mean_abs_error": float(np.mean(np.abs(errors))),
+    }
+
+
+def _n_features(n_assets: int, degree: int) -> int:
+    # constant, powers of each level, powers of the worst-of, pairwise cross terms
+    return 1 + degree * n_assets + degree + n_assets * (n_assets - 1) // 2
+
+
+def _features(x: np.ndarray, degree: int) -> np.ndarray:
+    """
+    Feature matrix, shape (n_states, n_features), for levels x of shape (n_states, n_assets).
+    """
+    n_states, n_assets = x.shape
+    worst = np.min(x, axis=1)
+    cols = [np.ones(n_states)]
+    for i in range(n_assets):
+        cols.extend(x[:, i] ** p for p in range(1, degree + 1))
+    cols.extend(worst ** p for p in range(1, degree + 1))
+    for i in range(n_assets):
+        for j in range(i + 1, n_assets):
+            cols.append(x[:, i] * x[:, j])
+    return np.column_stack(cols)
+
+
+def _feature_gradients(x: np.ndarray, degree: int) -> np.ndarray:
+    """
+    d features / d levels, shape (n_states, n_assets, n_features), matching _features.
+    """
+    n_states, n_assets = x.shape
+    grads = np.zeros((n_states, n_assets, _n_features(n_assets, degree)), dtype=float)
+
+    col = 1
+    for i in range(n_assets):
+        for p in range(1, degree + 1):
+            grads[:, i, col] = p * x[:, i] ** (p - 1)
+            col += 1
+
+    worst_idx = np.argmin(x, axis=1)
+    worst = x[np.arange(n_states), worst_idx]
+    for p in range(1, degree + 1):
+        grads[np.arange(n_states), worst_idx, col] = p * worst ** (p - 1)
+        col += 1
+
+    for i in range(n_assets):
+        for j in range(i + 1, n_assets):
+            grads[:, i, col] = x[:, j]
+            grads[:, j, col] = x[:, i]
+            col += 1
+    return grads
@@ -1,5 +1,5 @@
 import numpy as np
-from desk_sim.roll_pricer import price_from_state_mc
+from desk_sim.roll_pricer import _seeded_price_from_state, price_from_relative_paths
 
 def delta_from_state_fd(
     product,
@@ -9,20 +9,54 @@ def delta_from_state_fd(
     obs_indices_remaining: np.ndarray,
     n_paths: int,
     rel_bump: float = 0.01,
-    rng_seed: int = 0
+    rng_seed: int = 0,
+    sparse_grid: bool = False,
+    sampler: str = "pseudo",
+    path_cache=None,
+    memo=None,
+    dtype=np.float64,
+    path_buffer=None,
+    normals_buffer=None
 ) -> np.ndarray:
     """
     Delta per asset at current state using bump-and-reprice with common random numbers.
+    sparse_grid, sampler, path_cache, dtype, path_buffer and normals_buffer are passed to
+    price_from_state_mc; with a memo (memo.PricingMemo) the base and bumped prices are memoized.
     """
     n_assets = level_now.shape[0]
-    base_rng = np.random.default_rng(rng_seed)
-    base = price_from_state_mc(product, market, grid_remaining, level_now, obs_indices_remaining, n_paths, base_rng)
+    base = _seeded_price_from_state(product, market, grid_remaining, level_now, obs_indices_remaining, n_paths,
+                                    rng_seed, sparse_grid, sampler, path_cache, memo, dtype, path_buffer,
+                                    normals_buffer)
 
     deltas = np.empty(n_assets, dtype=float)
     for i in range(n_assets):
         bumped = level_now.copy()
         bumped[i] *= (1.0 + rel_bump)
-        bumped_rng = np.random.default_rng(rng_seed)
-        price_b = price_from_state_mc(product, market, grid_remaining, bumped, obs_indices_remaining, n_paths, bumped_rng)
+        price_b = _seeded_price_from_state(product, market, grid_remaining, bumped, obs_indices_remaining, n_paths,
+                                           rng_seed, sparse_grid, sampler, path_cache, memo, dtype, path_buffer,
+                                           normals_buffer)
+        deltas[i] = (price_b - base) / (level_now[i] * rel_bump)
+    return deltas
+
+
+def delta_from_relative_paths(
+    product,
+    market,
+    paths_rel: np.ndarray,                  # (n_paths, n_dates, n_assets), relative moves from now
+    level_now: np.ndarray,                  # (n_assets,)
+    obs_indices: np.ndarray,                # indices into axis 1 of paths_rel
+    rel_bump: float = 0.01
+) -> np.ndarray:
+    """
+    Delta per asset by bump-and-reprice on already simulated relative paths (common random numbers).
+    """
+    n_assets = level_now.shape[0]
+    base = price_from_relative_paths(product, market, paths_rel, level_now, obs_indices)
+
+    deltas = np.empty(n_assets, dtype=float)
+    for i in range(n_assets):
+        bumped = level_now.copy()
+        bumped[i] *= (1.0 + rel_bump)
+        price_b = price_from_relative_paths(product, market, paths_rel, bumped, obs_indices)
         deltas[i] = (price_b - base) / (level_now[i] * rel_bump)
     return deltas
@@ -1,7 +1,14 @@
 import numpy as np
-from desk_sim.instruments import AutocallableWorstOf, payoff_and_tau_from_levels
-from desk_sim.market import MarketParams, TimeGrid
-from desk_sim.dynamics import simulate_bs_normalised_levels
+from desk_sim.instruments import AutocallableWorstOf, payoff_and_tau_batch
+from desk_sim.market import (
+    MarketParams, TimeGrid, sparse_grid_indices, make_remaining_grid, remaining_obs_times, obs_times_to_indices,
+)
+from desk_sim.pricer_mc import simulate_paths, check_backend
+from desk_sim.fused import discounted_payoffs_fused
+from desk_sim.early_stop import discounted_payoffs_by_period
+from desk_sim.path_cache import PathCache
+from desk_sim.memo import PricingMemo, memoized
+from desk_sim import profiling
 
 def price_from_state_mc(
     product: AutocallableWorstOf,
@@ -11,22 +18,217 @@ def price_from_state_mc(
     obs_indices_remaining: np.ndarray,  # indices in remaining grid
     n_paths: int,
     rng: np.random.Generator | None = None,
+    sparse_grid: bool = False,
+    sampler: str = "pseudo",
+    path_cache: PathCache | None = None,
+    dtype=np.float64,
+    path_buffer: np.ndarray | None = None,
+    normals_buffer: np.ndarray | None = None,
+    backend: str = "cube",
 ) -> float:
     """
     Price at 'now' given current normalised levels, by simulating future *relative* moves.
+    With sparse_grid=True only the remaining observation dates and maturity are simulated.
+    sampler: "pseudo" or "sobol" (see dynamics.draw_normals).
+    path_cache: optional on-disk cache of the relative paths (see path_cache.PathCache).
+    dtype: precision of the simulated paths (float32 halves memory; the mean stays float64).
+    path_buffer, normals_buffer: optional scratch arrays reused for the paths and the normals
+        (see pricer_mc.simulate_paths).
+    backend: "cube", "fused" (no path cube) or "early_stop" (redeemed paths dropped at each
+        observation); see pricer_mc.price_autocallable_mc.
     """
+    check_backend(backend, sampler, path_cache, dtype)
     if rng is None:
         rng = np.random.default_rng()
 
-    # simulate future relative paths starting at 1
-    paths_rel = simulate_bs_normalised_levels(grid_remaining, market, n_paths, rng=rng)
-    # scale by current level
-    paths = paths_rel * level_now[None, None, :]
+    with profiling.stage("price_from_state_mc", paths=n_paths):
+        if backend == "fused":
+            sim_idx, obs_pos = None, obs_indices_remaining
+            if sparse_grid:
+                sim_idx, obs_pos = sparse_grid_indices(grid_remaining, obs_indices_remaining)
+            disc, _ = discounted_payoffs_fused(product, market, grid_remaining, n_paths, rng, obs_pos, sim_idx,
+                                               level_now=level_now)
+            return float(np.mean(disc))
+        if backend == "early_stop":
+            disc, _, _, _ = discounted_payoffs_by_period(product, market, grid_remaining, n_paths, rng,
+                                                         obs_indices_remaining, level_now, dtype)
+            return float(np.mean(disc))
+
+        # simulate future relative paths starting at 1
+        paths_rel, obs_indices_remaining = simulate_relative_paths(
+            grid_remaining, market, n_paths, rng, obs_indices_remaining, sparse_grid, sampler, path_cache, dtype,
+            path_buffer, normals_buffer,
+        )
+        return price_from_relative_paths(product, market, paths_rel, level_now, obs_indices_remaining)
+
+
+def _seeded_price_from_state(
+    product: AutocallableWorstOf,
+    market: MarketParams,
+    grid_remaining: TimeGrid,
+    level_now: np.ndarray,
+    obs_indices_remaining: np.ndarray,
+    n_paths: int,
+    rng_seed: int,
+    sparse_grid: bool = False,
+    sampler: str = "pseudo",
+    path_cache: PathCache | None = None,
+    memo: PricingMemo | None = None,
+    dtype=np.float64,
+    path_buffer: np.ndarray | None = None,
+    normals_buffer: np.ndarray | None = None,
+) -> float:
+    """
+    price_from_state_mc with a fresh generator seeded with rng_seed, through memo if given.
+    """
+    return memoized(
+        memo,
+        lambda: price_from_state_mc(
+            product, market, grid_remaining, level_now, obs_indices_remaining, n_paths,
+            rng=np.random.default_rng(rng_seed), sparse_grid=sparse_grid, sampler=sampler, path_cache=path_cache,
+            dtype=dtype, path_buffer=path_buffer, normals_buffer=normals_buffer,
+        ),
+        "price_from_state_mc", product, market, grid_remaining, level_now, obs_indices_remaining, n_paths,
+        rng_seed, sparse_grid, sampler, np.dtype(dtype).name,
+    )
+
+
+def simulate_relative_paths(
+    grid_remaining: TimeGrid,
+    market: MarketParams,
+    n_paths: int,
+    rng: np.random.Generator,
+    obs_indices_remaining: np.ndarray,
+    sparse_grid: bool = False,
+    sampler: str = "pseudo",
+    path_cache: PathCache | None = None,
+    dtype=np.float64,
+    path_buffer: np.ndarray | None = None,
+    normals_buffer: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Future relative paths starting at 1, dense or on the sparse grid.
+
+    Returns:
+        paths_rel: shape (n_paths, n_dates, n_assets)
+        obs_indices: observation indices into axis 1 of paths_rel
+    """
+    sim_idx = None
+    if sparse_grid:
+        sim_idx, obs_indices_remaining = sparse_grid_indices(grid_remaining, obs_indices_remaining)
+    paths_rel = simulate_paths(grid_remaining, market, n_paths, rng, sim_idx, sampler, path_cache, dtype, path_buffer,
+                               normals_buffer)
+    return paths_rel, np.asarray(obs_indices_remaining, dtype=int)
+
+
+def price_from_relative_paths(
+    product: AutocallableWorstOf,
+    market: MarketParams,
+    paths_rel: np.ndarray,              # (n_paths, n_dates, n_assets), relative moves starting at 1
+    level_now: np.ndarray,              # shape (n_assets,)
+    obs_indices: np.ndarray,            # indices into axis 1 of paths_rel
+) -> float:
+    """
+    Price at 'now' from already simulated future relative paths, scaled by the current level.
+    """
+    # scale by current level (in the precision of the paths)
+    paths = paths_rel * np.asarray(level_now, dtype=paths_rel.dtype)[None, None, :]
 
     r = float(market.rate)
-    disc = np.empty(n_paths, dtype=float)
-    for p in range(n_paths):
-        payoff, tau = payoff_and_tau_from_levels(product, paths[p], obs_indices_remaining)
-        disc[p] = np.exp(-r * tau) * payoff
+    payoffs, taus = payoff_and_tau_batch(product, paths, obs_indices)
+    disc = np.exp(-r * taus) * payoffs
 
     return float(np.mean(disc))
+
+
+def prices_from_relative_paths(
+    product: AutocallableWorstOf,
+    market: MarketParams,
+    paths_rel: np.ndarray,              # (n_paths, n_dates, n_assets), relative moves starting at 1
+    levels_now: np.ndarray,             # shape (n_states, n_assets)
+    obs_indices: np.ndarray,            # indices into axis 1 of paths_rel
+    max_elements: int = 2**24,
+) -> np.ndarray:
+    """
+    price_from_relative_paths for many current states at once, on the same relative paths.
+    States are processed in blocks of at most max_elements simulated levels.
+
+    Returns:
+        prices: shape (n_states,)
+    """
+    levels_now = np.atleast_2d(np.asarray(levels_now, dtype=float))
+    n_states = levels_now.shape[0]
+    n_paths, n_dates, n_assets = paths_rel.shape
+    if levels_now.shape[1] != n_assets:
+        raise ValueError("levels_now must have shape (n_states, n_assets)")
+
+    r = float(market.rate)
+    block = max(1, int(max_elements // (n_paths * n_dates * n_assets)))
+    prices = np.empty(n_states, dtype=float)
+    for start in range(0, n_states, block):
+        stop = min(start + block, n_states)
+        paths = paths_rel[None, :, :, :] * levels_now[start:stop, None, None, :].astype(paths_rel.dtype)
+        payoffs, taus = payoff_and_tau_batch(product, paths.reshape(-1, n_dates, n_assets), obs_indices)
+        disc = (np.exp(-r * taus) * payoffs).reshape(stop - start, n_paths)
+        prices[start:stop] = np.mean(disc, axis=1)
+    return prices
+
+
+def relative_paths_from_master(
+    master: np.ndarray,                 # (n_paths, n_steps, n_assets), normalised levels on the full grid
+    t_idx: int,
+    obs_indices_remaining: np.ndarray,  # indices in the remaining grid starting at t_idx
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Future relative moves seen from grid point t_idx, read off one master simulation instead
+    of simulating again. Under constant-parameter GBM, master[:, t_idx + j] / master[:, t_idx]
+    has the law of a fresh relative path over j steps.
+
+    Only the remaining observation dates and maturity are extracted.
+
+    Returns:
+        paths_rel: shape (n_paths, n_dates, n_assets)
+        obs_positions: observation indices into axis 1 of paths_rel
+    """
+    n_steps = master.shape[1]
+    if not 0 <= t_idx < n_steps:
+        raise ValueError("t_idx must lie within the master grid")
+
+    abs_obs = t_idx + np.asarray(obs_indices_remaining, dtype=int)
+    if np.any(abs_obs >= n_steps):
+        raise ValueError("obs_indices_remaining run past the master grid")
+
+    cols = np.unique(np.concatenate((abs_obs, [n_steps - 1])))
+    obs_positions = np.searchsorted(cols, abs_obs)
+    paths_rel = master[:, cols, :] / master[:, t_idx, None, :]
+    return paths_rel, obs_positions.astype(int)
+
+
+def remaining_product(
+    product: AutocallableWorstOf,
+    full_grid: TimeGrid,
+    t_idx: int,
+) -> tuple[AutocallableWorstOf, TimeGrid, np.ndarray]:
+    """
+    Product, grid and observation indices for the remaining horizon seen from grid point t_idx.
+    """
+    now_time = float(full_grid.times[t_idx])
+    rem_grid = make_remaining_grid(full_grid, t_idx)
+    rem_obs_times = remaining_obs_times(product.obs_times, now_time)
+
+    # if no remaining obs times, keep maturity only (your payoff already handles maturity)
+    if rem_obs_times.size == 0:
+        obs_idx = np.array([len(rem_grid.times) - 1], dtype=int)
+        product_rem = product  # maturity in payoff handled by last point
+    else:
+        # product for remaining horizon: shift maturity
+        product_rem = type(product)(
+            maturity=float(product.maturity - now_time),
+            obs_times=rem_obs_times,
+            coupon_rate=product.coupon_rate,
+            autocall_barrier=product.autocall_barrier,
+            protection_barrier=product.protection_barrier,
+            notional=product.notional,
+        )
+        obs_idx = obs_times_to_indices(rem_grid, product_rem.obs_times)
+    return product_rem, rem_grid, obs_idx
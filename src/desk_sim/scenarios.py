@@ -1,5 +1,10 @@
 import numpy as np
-from desk_sim.market import MarketParams
+from desk_sim.market import MarketParams, compile_market
+
+# Scenario markets are derived from a compiled market.MarketModel: no revalidation, the
+# Cholesky factor is reused for vol moves, and stressed correlations that are not positive
+# definite are repaired to the nearest correlation matrix instead of failing. The base
+# market's own corr must be valid: compile_market raises on it.
 
 
 def base_scenario(market: MarketParams) -> MarketParams:
@@ -7,27 +12,28 @@ def base_scenario(market: MarketParams) -> MarketParams:
 
 
 def vol_up(market: MarketParams, bump: float = 0.1) -> MarketParams:
-    return MarketParams(
-        rate=market.rate,
-        vols=market.vols * (1.0 + bump),
-        corr=market.corr,
-    )
+    return compile_market(market).with_vols(market.vols * (1.0 + bump))
 
 
 def vol_down(market: MarketParams, bump: float = 0.1) -> MarketParams:
-    return MarketParams(
-        rate=market.rate,
-        vols=market.vols * (1.0 - bump),
-        corr=market.corr,
-    )
+    return compile_market(market).with_vols(market.vols * (1.0 - bump))
 
 
 def corr_breakdown(market: MarketParams, target_corr: float = 0.0) -> MarketParams:
     n = market.vols.shape[0]
     corr = np.full((n, n), target_corr)
     np.fill_diagonal(corr, 1.0)
-    return MarketParams(
-        rate=market.rate,
-        vols=market.vols,
-        corr=corr,
-    )
+    return compile_market(market).with_corr(corr, repair=True)
+
+
+def vol_shift(market: MarketParams, shifts: np.ndarray) -> MarketParams:
+    vols = market.vols + np.asarray(shifts, dtype=float)
+    if np.any(vols <= 0):
+        raise ValueError("vol shift produced non-positive vol")
+    return compile_market(market).with_vols(vols)
+
+
+def corr_shift(market: MarketParams, shift: float, max_abs_corr: float = 0.999) -> MarketParams:
+    corr = np.clip(market.corr + shift, -max_abs_corr, max_abs_corr)
+    np.fill_diagonal(corr, 1.0)
+    return compile_market(market).with_corr(corr, repair=True)
@@ -0,0 +1,151 @@
+"""
+Structuring helpers: price many coupon / barrier variants of one autocallable from a single
+path set, and solve for the par coupon without re-simulating.
+
+Given the autocall barrier, the redemption date tau of a path does not depend on the coupon,
+and the discounted payoff is
+    called:     exp(-r*tau) * N * (1 + c*tau)
+    not called: exp(-r*T) * redemption(worst_T, protection_barrier)
+so Price(c) = A + c * B with
+    A = E[ called * exp(-r*tau) * N + (1 - called) * exp(-r*T) * redemption ]
+    B = E[ called * exp(-r*tau) * N * tau ]
+and the par coupon is (target - A) / B.
+"""
+
+import numpy as np
+
+from desk_sim.instruments import AutocallableWorstOf
+from desk_sim.market import MarketParams, TimeGrid, obs_times_to_indices, sparse_grid_indices
+from desk_sim.dynamics import simulate_bs_levels_at_indices
+
+
+def price_variants(
+    product: AutocallableWorstOf,
+    market: MarketParams,
+    grid: TimeGrid,
+    n_paths: int,
+    coupon_rates: np.ndarray | None = None,
+    autocall_barriers: np.ndarray | None = None,
+    protection_barriers: np.ndarray | None = None,
+    rng: np.random.Generator | None = None,
+    sampler: str = "pseudo"
+) -> dict:
+    """
+    Prices of every combination of the given terms (None keeps the product's own value),
+    all from one sparse-grid simulation. Maturity, observation dates and notional are the
+    product's. Combinations with protection_barrier > autocall_barrier are NaN.
+
+    Returns:
+        dict with "prices" of shape (n_coupons, n_autocall, n_protection) and the term arrays
+        "coupon_rates", "autocall_barriers", "protection_barriers"
+    """
+    coupon_rates = _terms(coupon_rates, product.coupon_rate)
+    autocall_barriers, protection_barriers, A, B = _coupon_decomposition(
+        product, market, grid, n_paths, autocall_barriers, protection_barriers, rng, sampler
+    )
+    prices = A[None, :, :] + coupon_rates[:, None, None] * B[None, :, None]
+    return {
+        "prices": prices,
+        "coupon_rates": coupon_rates,
+        "autocall_barriers": autocall_barriers,
+        "protection_barriers": protection_barriers,
+    }
+
+
+def solve_par_coupon(
+    product: AutocallableWorstOf,
+    market: MarketParams,
+    grid: TimeGrid,
+    n_paths: int,
+    target_price: float | None = None,
+    autocall_barriers: np.ndarray | None = None,
+    protection_barriers: np.ndarray | None = None,
+    rng: np.random.Generator | None = None,
+    sampler: str = "pseudo"
+) -> dict:
+    """
+    Coupon rate that prices the note at target_price (default: the notional, i.e. par) for
+    every barrier combination, from one simulation. Exact on the simulated paths: no root-find.
+
+    Returns:
+        dict with "coupons" of shape (n_autocall, n_protection), the coupon-free value "A"
+        (same shape), the value per unit of coupon "B" (n_autocall,), and the barrier arrays
+    """
+    if target_price is None:
+        target_price = product.notional
+    autocall_barriers, protection_barriers, A, B = _coupon_decomposition(
+        product, market, grid, n_paths, autocall_barriers, protection_barriers, rng, sampler
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # B = 0 when no path ever autocalls: the coupon cannot move the price
+        coupons = np.where(B[:, None] > 0, (target_price - A) / B[:, None], np.nan)
+    return {
+        "coupons": coupons,
+        "A": A,
+        "B": B,
+        "autocall_barriers": autocall_barriers,
+        "protection_barriers": protection_barriers,
+    }
+
+
+def _terms(values: np.ndarray | None, default: float) -> np.ndarray:
+    values = np.atleast_1d(np.asarray(default if values is None else values, dtype=float))
+    if values.ndim != 1 or values.size == 0:
+        raise ValueError("terms must be non-empty 1D arrays")
+    return values
+
+
+def _coupon_decomposition(
+    product: AutocallableWorstOf,
+    market: MarketParams,
+    grid: TimeGrid,
+    n_paths: int,
+    autocall_barriers: np.ndarray | None,
+    protection_barriers: np.ndarray | None,
+    rng: np.random.Generator | None,
+    sampler: str
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Simulate once and return (autocall_barriers, protection_barriers, A, B), with
+    A of shape (n_autocall, n_protection) and B of shape (n_autocall,).
+    """
+    if n_paths <= 0:
+        raise ValueError("n_paths must be > 0")
+    autocall_barriers = _terms(autocall_barriers, product.autocall_barrier)
+    protection_barriers = _terms(protection_barriers, product.protection_barrier)
+    if np.any(autocall_barriers <= 0) or np.any(protection_barriers <= 0):
+        raise ValueError("barriers must be positive")
+    if rng is None:
+        rng = np.random.default_rng()
+
+    obs_idx = obs_times_to_indices(grid, product.obs_times)
+    sim_idx, obs_pos = sparse_grid_indices(grid, obs_idx)
+    paths = simulate_bs_levels_at_indices(grid, market, n_paths, sim_idx, rng=rng, sampler=sampler)
+
+    # the worst-of is all the payoff reads, whatever the terms
+    worst_obs = np.min(paths[:, obs_pos, :], axis=2)          # (n_paths, n_obs)
+    worst_T = np.min(paths[:, -1, :], axis=1)                 # (n_paths,)
+    del paths
+
+    r = float(market.rate)
+    N = product.notional
+    obs_times = np.asarray(product.obs_times, dtype=float)
+    disc_T = np.exp(-r * product.maturity)
+
+    A = np.empty((autocall_barriers.size, protection_barriers.size), dtype=float)
+    B = np.empty(autocall_barriers.size, dtype=float)
+    for a, barrier in enumerate(autocall_barriers):
+        hit = worst_obs >= barrier
+        called = np.any(hit, axis=1)
+        tau_call = obs_times[np.argmax(hit, axis=1)]
+        disc_call = np.where(called, np.exp(-r * tau_call), 0.0)
+
+        B[a] = N * np.mean(disc_call * tau_call)
+        call_leg = N * np.mean(disc_call)
+        for p, protection in enumerate(protection_barriers):
+            redemption = np.where(worst_T >= protection, N, N * worst_T)
+            A[a, p] = call_leg + disc_T * np.mean(np.where(called, 0.0, redemption))
+
+    # the product itself forbids protection above the autocall barrier
+    A[protection_barriers[None, :] > autocall_barriers[:, None]] = np.nan
+    return autocall_barriers, protection_barriers, A, B
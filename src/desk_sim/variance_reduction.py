@@ -0,0 +1,115 @@
+"""
+Variance reduction building blocks for the autocallable Monte Carlo pricer:
+control variates on simulated levels and conditional Monte Carlo over the final jump.
+Antithetic normals live in dynamics (antithetic=True).
+"""
+
+import math
+import numpy as np
+
+from desk_sim.instruments import AutocallableWorstOf
+from desk_sim.market import MarketParams, cholesky_factor
+
+
+_erfc = np.vectorize(math.erfc, otypes=[float])
+
+
+def _norm_cdf(x: np.ndarray) -> np.ndarray:
+    return 0.5 * _erfc(-np.asarray(x, dtype=float) / math.sqrt(2.0))
+
+
+def level_controls(
+    paths: np.ndarray,           # (n_paths, n_dates, n_assets)
+    date_indices: np.ndarray,    # positions in axis 1 to use as controls
+    grid_indices: np.ndarray,    # grid index of each of those positions
+    market: MarketParams,
+    dt: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Simulated levels at the given dates as control variates, with their exact means.
+    The simulator drifts by r * dt per grid step, so E[level(idx)] = exp(r * dt * idx).
+
+    Returns:
+        controls: shape (n_paths, n_dates_used * n_assets)
+        means: shape (n_dates_used * n_assets,)
+    """
+    n_paths, _, n_assets = paths.shape
+    controls = paths[:, date_indices, :].reshape(n_paths, -1)
+    means = np.repeat(np.exp(float(market.rate) * dt * np.asarray(grid_indices, dtype=float)), n_assets)
+    return controls, means
+
+
+def control_variate_adjust(
+    y: np.ndarray,               # (n_paths,) per-path estimator values
+    controls: np.ndarray,        # (n_paths, n_controls)
+    means: np.ndarray            # (n_controls,)
+) -> np.ndarray:
+    """
+    y - (controls - means) @ beta with beta the least-squares regression coefficient of y on
+    the controls (estimated from the same paths).
+    """
+    centred = controls - controls.mean(axis=0)
+    beta, *_ = np.linalg.lstsq(centred, y - y.mean(), rcond=None)
+    return y - (controls - means) @ beta
+
+
+def conditional_final_discounted_payoff(
+    product: AutocallableWorstOf,
+    market: MarketParams,
+    paths: np.ndarray,           # (n_paths, n_dates, n_assets)
+    Z_last: np.ndarray,          # (n_paths, n_assets) normals of the final jump
+    last_jump_dt: float,
+    final_is_obs: bool,
+    tau_final_obs: float
+) -> np.ndarray:
+    """
+    E[ discounted payoff | everything but the last asset's own normal of the final jump ],
+    for paths still alive before the final date.
+
+    With a lower-triangular Cholesky factor, the first n-1 assets' final levels only depend on
+    the first n-1 normals, so conditionally their worst m is known and the last asset's final
+    level Y is lognormal. The expectation of the piecewise payoff of min(m, Y) is closed form.
+
+    Returns:
+        shape (n_paths,), conditional discounted payoff (valid for paths not yet called)
+    """
+    n_assets = paths.shape[2]
+    r = float(market.rate)
+    vols = market.vols.astype(float)
+    L = cholesky_factor(market)
+    k = n_assets - 1
+
+    m = np.min(paths[:, -1, :k], axis=1)
+
+    sd = vols[k] * math.sqrt(last_jump_dt)
+    mu = (np.log(paths[:, -2, k]) + (r - 0.5 * vols[k] ** 2) * last_jump_dt
+          + sd * (Z_last[:, :k] @ L[k, :k]))
+    s = sd * L[k, k]
+
+    N = product.notional
+    disc_T = math.exp(-r * product.maturity)
+    upper = product.autocall_barrier if final_is_obs else np.inf
+    a_hi = math.exp(-r * tau_final_obs) * N * (1.0 + product.coupon_rate * tau_final_obs) if final_is_obs else 0.0
+    p = product.protection_barrier
+
+    def cdf(level):
+        level = np.broadcast_to(np.asarray(level, dtype=float), mu.shape)
+        with np.errstate(divide="ignore"):
+            return _norm_cdf((np.log(level) - mu) / s)
+
+    def g(w):
+        return np.where(w >= upper, a_hi, np.where(w >= p, disc_T * N, disc_T * N * w))
+
+    def prob(lo, hi):
+        return np.maximum(cdf(hi) - cdf(lo), 0.0) * (np.asarray(hi) > np.asarray(lo))
+
+    k_low = np.minimum(m, p)
+    with np.errstate(divide="ignore"):
+        partial_mean = np.exp(mu + 0.5 * s**2) * _norm_cdf((np.log(k_low) - mu - s**2) / s)
+
+    value = (1.0 - cdf(m)) * g(m)                                   # Y >= m: worst is m
+    value = value + disc_T * N * partial_mean                       # Y < min(m, p): pays N * Y
+    value = value + disc_T * N * prob(p, np.minimum(m, upper))      # p <= Y < min(m, upper)
+    if final_is_obs:
+        value = value + a_hi * prob(upper, m)                       # upper <= Y < m: autocall
+    return value
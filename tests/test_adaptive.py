@@ -0,0 +1,93 @@
+import numpy as np
+from desk_sim.instruments import AutocallableWorstOf
+from desk_sim.market import MarketParams, make_time_grid
+from desk_sim.adaptive import price_to_tolerance, price_from_state_to_tolerance
+from desk_sim.hedge_sim import run_delta_hedge_one_path
+
+
+def test_stops_when_target_met():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.5, 1.0]),
+        coupon_rate=0.06,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.01,
+        vols=np.array([0.2, 0.25]),
+        corr=np.array([[1.0, 0.4], [0.4, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=252)
+    price, diag = price_to_tolerance(product, market, grid, target_stderr=0.2, batch_size=2000,
+                                     rng=np.random.default_rng(0))
+
+    assert diag["stop_reason"] == "target_met"
+    assert diag["std_error"] <= 0.2
+    assert diag["n_paths"] % 2000 == 0
+    assert 0.0 < price < 200.0
+
+
+def test_stops_at_max_paths():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.5, 1.0]),
+        coupon_rate=0.06,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.01,
+        vols=np.array([0.2, 0.25]),
+        corr=np.array([[1.0, 0.4], [0.4, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=252)
+    _, diag = price_to_tolerance(product, market, grid, rel_tol=1e-9, batch_size=1000, max_paths=3000,
+                                 rng=np.random.default_rng(0))
+    assert diag["stop_reason"] == "max_paths"
+    assert diag["n_paths"] == 3000
+
+
+def test_state_pricing_deep_in_the_money_needs_fewer_paths():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.5, 1.0]),
+        coupon_rate=0.06,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.01,
+        vols=np.array([0.2, 0.25]),
+        corr=np.array([[1.0, 0.4], [0.4, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=252)
+    kwargs = dict(target_stderr=0.05, batch_size=1000, max_paths=200_000, rng=np.random.default_rng(1))
+    _, easy = price_from_state_to_tolerance(product, market, grid, np.array([1.5, 1.5]), np.array([126, 252]), **kwargs)
+    kwargs["rng"] = np.random.default_rng(1)
+    _, hard = price_from_state_to_tolerance(product, market, grid, np.array([1.0, 1.0]), np.array([126, 252]), **kwargs)
+    assert easy["n_paths"] < hard["n_paths"]
+
+
+def test_hedge_loop_with_target_stderr():
+    product = AutocallableWorstOf(
+        maturity=0.25,
+        obs_times=np.array([0.25]),
+        coupon_rate=0.06,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.01,
+        vols=np.array([0.2, 0.25]),
+        corr=np.array([[1.0, 0.4], [0.4, 1.0]])
+    )
+    grid = make_time_grid(maturity=0.25, steps_per_year=252)
+    df = run_delta_hedge_one_path(product, market, grid, n_paths_pricing=4000, rng_seed_path=1,
+                                  rng_seed_pricer=2, target_stderr=0.5)
+    assert "n_paths_V" in df.columns
+    assert np.all(df["n_paths_V"] <= 4000)
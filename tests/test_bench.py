@@ -0,0 +1,38 @@
+import pytest
+from desk_sim.bench import BenchCase, sweep, default_cases, run_benchmarks, append_history, load_history, baseline_run, compare
+
+
+def test_run_and_record_history(tmp_path):
+    cases = sweep(n_paths=(200,), n_assets=(2, 3), steps_per_year=(12,))
+    assert [c.name for c in cases] == ["p200_a2_T1_s12", "p200_a3_T1_s12"]
+
+    records = run_benchmarks(cases, names=["price_autocallable_mc", "payoff_and_tau_batch"], repeats=1)
+    assert len(records) == 4
+    assert all(r["wall_time"] > 0 and r["paths_per_sec"] > 0 and r["peak_mb"] >= 0 for r in records)
+
+    path = str(tmp_path / "history.json")
+    append_history(path, records, label="baseline")
+    append_history(path, records)
+    history = load_history(path)
+    assert len(history["runs"]) == 2
+    assert baseline_run(history, "baseline")["records"] == records
+
+    with pytest.raises(ValueError):
+        run_benchmarks(cases, names=["no_such_benchmark"])
+
+
+def test_default_sweep_skips_largest_corner():
+    cases = default_cases()
+    assert len(cases) == 14
+    assert BenchCase(100_000, 4, 3.0, 252) not in cases and BenchCase(100_000, 4, 3.0, 52) in cases
+    assert len(default_cases(quick=True)) == 1
+
+
+def test_compare_flags_regressions_beyond_threshold():
+    case = BenchCase(n_paths=100)
+    base = [{"benchmark": "b", "case": case.name, "wall_time": 1.0, "peak_mb": 10.0}]
+    slower = [{"benchmark": "b", "case": case.name, "wall_time": 1.3, "peak_mb": 10.5}]
+
+    regressions = compare(slower, base, threshold=0.1)
+    assert [(r["metric"], round(r["ratio"], 2)) for r in regressions] == [("wall_time", 1.3)]
+    assert compare(slower, base, threshold=0.5) == []
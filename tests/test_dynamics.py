@@ -1,6 +1,10 @@
 import numpy as np
+import pytest
 from desk_sim.market import MarketParams, make_time_grid
-from desk_sim.dynamics import simulate_bs_normalised_levels
+from desk_sim.dynamics import (
+    simulate_bs_normalised_levels, simulate_bs_levels_at_indices, draw_normals, brownian_bridge_increments,
+    path_buffer_view,
+)
 
 
 def test_shapes_and_initial_level():
@@ -41,3 +45,123 @@ def test_empirical_correlation_roughly_matches():
     emp_corr = np.corrcoef(logret.T)[0, 1]
 
     assert emp_corr > 0.6  # loose bound
+
+
+def test_sparse_levels_shape_and_marginals():
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.2, 0.3]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=252)
+    sim_idx = np.array([0, 63, 126, 252])
+    paths = simulate_bs_levels_at_indices(grid, market, n_paths=50_000, sim_indices=sim_idx,
+                                          rng=np.random.default_rng(3))
+
+    assert paths.shape == (50_000, 4, 2)
+    assert np.allclose(paths[:, 0, :], 1.0)
+
+    # E[level(T)] = exp(r*T) under the risk-neutral drift
+    assert np.allclose(paths[:, -1, :].mean(axis=0), np.exp(0.02), rtol=0.01)
+    logvar = np.var(np.log(paths[:, -1, :]), axis=0)
+    assert np.allclose(logvar, market.vols**2, rtol=0.03)
+
+
+def test_brownian_bridge_increments_are_standard_normal():
+    rng = np.random.default_rng(4)
+    jump_dt = np.array([0.25, 0.25, 0.1, 0.4])
+    Z = brownian_bridge_increments(rng.standard_normal((200_000, 4, 1)), jump_dt)
+
+    cov = np.cov(Z[:, :, 0].T)
+    assert np.allclose(cov, np.eye(4), atol=0.02)
+
+
+def test_sobol_normals_shape():
+    pytest.importorskip("scipy")
+    grid = make_time_grid(maturity=1.0, steps_per_year=252)
+    Z = draw_normals(grid, np.array([0, 63, 126, 252]), 1024, 2, np.random.default_rng(0), sampler="sobol")
+
+    assert Z.shape == (1024, 3, 2)
+    assert abs(Z.mean()) < 0.01
+
+
+def test_float32_paths_track_float64_on_same_draws():
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.2, 0.25]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=252)
+    p64 = simulate_bs_normalised_levels(grid, market, n_paths=500, rng=np.random.default_rng(3))
+    p32 = simulate_bs_normalised_levels(grid, market, n_paths=500, rng=np.random.default_rng(3), dtype=np.float32)
+    assert p32.dtype == np.float32
+    assert np.max(np.abs(p32 / p64 - 1.0)) < 1e-4
+
+    idx = np.array([0, 63, 126, 252])
+    s32 = simulate_bs_levels_at_indices(grid, market, 500, idx, rng=np.random.default_rng(3), dtype=np.float32)
+    s64 = simulate_bs_levels_at_indices(grid, market, 500, idx, rng=np.random.default_rng(3))
+    assert s32.dtype == np.float32
+    assert np.allclose(s32, s64, rtol=1e-5)
+
+    with pytest.raises(ValueError):
+        simulate_bs_normalised_levels(grid, market, n_paths=10, dtype=np.float16)
+
+
+def test_whole_cube_kernel_writes_into_caller_buffer():
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.2, 0.25]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=52)
+    n_steps = grid.times.shape[0]
+    expected = simulate_bs_normalised_levels(grid, market, n_paths=300, rng=np.random.default_rng(4))
+
+    # exact lognormal jumps on every date are the same kernel
+    every = simulate_bs_levels_at_indices(grid, market, 300, np.arange(n_steps), rng=np.random.default_rng(4))
+    assert np.array_equal(every, expected)
+
+    # the dense simulator agrees with compounding step by step
+    Z = np.random.default_rng(4).standard_normal((300, n_steps - 1, 2))
+    L = np.linalg.cholesky(market.corr)
+    stepwise = np.ones((300, n_steps, 2))
+    for t in range(1, n_steps):
+        incr = (0.02 - 0.5 * market.vols**2) * grid.dt + market.vols * np.sqrt(grid.dt) * (Z[:, t - 1] @ L.T)
+        stepwise[:, t] = stepwise[:, t - 1] * np.exp(incr)
+    assert np.allclose(expected, stepwise, rtol=1e-12)
+
+    buffer = np.full(400 * n_steps * 2, np.nan)
+    out = path_buffer_view(buffer, (300, n_steps, 2))
+    paths = simulate_bs_normalised_levels(grid, market, n_paths=300, rng=np.random.default_rng(4), out=out)
+    assert paths is out and np.shares_memory(paths, buffer)
+    assert np.array_equal(paths, expected)
+
+    with pytest.raises(ValueError):
+        path_buffer_view(buffer, (500, n_steps, 2))
+    with pytest.raises(ValueError):
+        simulate_bs_normalised_levels(grid, market, n_paths=300, out=out.astype(np.float32))
+
+
+def test_normals_buffer_reproduces_fresh_draws():
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.2, 0.25]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=52)
+    n_steps = grid.times.shape[0]
+    normals = np.full(400 * (n_steps - 1) * 2, np.nan)
+
+    for antithetic in (False, True):
+        expected = simulate_bs_normalised_levels(grid, market, 300, np.random.default_rng(5), antithetic=antithetic)
+        view = path_buffer_view(normals, (300, n_steps - 1, 2))
+        paths = simulate_bs_normalised_levels(
+            grid, market, 300, np.random.default_rng(5), antithetic=antithetic, normals_out=view
+        )
+        assert np.array_equal(paths, expected)
+
+    sim_idx = np.array([0, 13, 26, n_steps - 1])
+    expected = simulate_bs_levels_at_indices(grid, market, 300, sim_idx, rng=np.random.default_rng(6))
+    view = path_buffer_view(normals, (300, 3, 2))
+    paths = simulate_bs_levels_at_indices(grid, market, 300, sim_idx, rng=np.random.default_rng(6), normals_out=view)
+    assert np.array_equal(paths, expected)
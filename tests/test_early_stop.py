@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+from desk_sim.instruments import AutocallableWorstOf
+from desk_sim.market import MarketParams, make_time_grid, obs_times_to_indices
+from desk_sim.pricer_mc import price_autocallable_mc
+from desk_sim.roll_pricer import price_from_state_mc
+
+
+@pytest.mark.parametrize("sparse_grid", [False, True])
+def test_early_stop_prices_like_full_simulation(sparse_grid):
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.25, 0.5, 0.75, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.25, 0.3]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=52)
+    n = 20_000
+    p_full, d_full = price_autocallable_mc(product, market, grid, n, rng=np.random.default_rng(0),
+                                           sparse_grid=sparse_grid, return_diag=True)
+    p_es, d_es = price_autocallable_mc(product, market, grid, n, rng=np.random.default_rng(1),
+                                       sparse_grid=sparse_grid, backend="early_stop", return_diag=True)
+    se = np.hypot(d_full["std_discounted_payoff"], d_es["std_discounted_payoff"]) / np.sqrt(n)
+    assert abs(p_es - p_full) < 4 * se
+
+
+def test_survival_counts_and_work_saved():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.25, 0.5, 0.75, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.25, 0.3]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=52)
+    n = 5000
+    _, diag = price_autocallable_mc(product, market, grid, n, rng=np.random.default_rng(0),
+                                    backend="early_stop", chunk_size=2000, return_diag=True)
+    survival = diag["survival_counts"]
+    assert survival.shape == (4,)
+    assert survival[0] == n
+    assert np.all(np.diff(survival) <= 0)
+    # every path dropped before the last period was called
+    assert n - survival[-1] <= diag["call_probability"] * n
+
+    # each period is one jump, simulated for its survivors only
+    assert diag["simulated_steps"] == int(survival.sum())
+    assert diag["full_steps"] == n * 4
+    assert diag["work_saved"] == pytest.approx(1.0 - diag["simulated_steps"] / diag["full_steps"])
+    assert diag["work_saved"] > 0.1
+
+
+def test_early_stop_price_from_state():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.25, 0.5, 0.75, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.25, 0.3]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=52)
+    obs_idx = obs_times_to_indices(grid, product.obs_times)
+    level_now = np.array([0.95, 1.1])
+    prices = [
+        price_from_state_mc(product, market, grid, level_now, obs_idx, 20_000, rng=np.random.default_rng(seed),
+                            backend=backend)
+        for seed, backend in ((0, "cube"), (1, "early_stop"))
+    ]
+    assert prices[1] == pytest.approx(prices[0], abs=0.5)
+
+
+def test_early_stop_rejects_unsupported_modes():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.25, 0.5, 0.75, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.25, 0.3]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=52)
+    with pytest.raises(ValueError):
+        price_autocallable_mc(product, market, grid, 100, backend="early_stop", control_variate=True)
+    with pytest.raises(ValueError):
+        price_autocallable_mc(product, market, grid, 128, backend="early_stop", sampler="sobol")
@@ -0,0 +1,131 @@
+import numpy as np
+import pytest
+from desk_sim.instruments import AutocallableWorstOf
+from desk_sim.market import MarketParams, make_time_grid, obs_times_to_indices
+from desk_sim.pricer_mc import price_autocallable_mc
+from desk_sim.roll_pricer import price_from_state_mc
+from desk_sim import fused
+
+
+@pytest.mark.parametrize("sparse_grid", [False, True])
+def test_fused_matches_cube_backend(sparse_grid):
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.25, 0.5, 0.75, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.2, 0.25, 0.3]),
+        corr=np.array([[1.0, 0.5, 0.3], [0.5, 1.0, 0.4], [0.3, 0.4, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=52)
+    kwargs = dict(sparse_grid=sparse_grid, chunk_size=700, return_diag=True)
+    p_cube, d_cube = price_autocallable_mc(product, market, grid, 2000, rng=np.random.default_rng(3), **kwargs)
+    p_fused, d_fused = price_autocallable_mc(product, market, grid, 2000, rng=np.random.default_rng(3),
+                                             backend="fused", **kwargs)
+    assert p_fused == pytest.approx(p_cube, rel=1e-12)
+    assert d_fused["call_probability"] == d_cube["call_probability"]
+    assert d_fused["avg_tau"] == pytest.approx(d_cube["avg_tau"], rel=1e-12)
+
+
+def test_fused_price_from_state_matches_cube():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.25, 0.5, 0.75, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.2, 0.25, 0.3]),
+        corr=np.array([[1.0, 0.5, 0.3], [0.5, 1.0, 0.4], [0.3, 0.4, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=52)
+    obs_idx = obs_times_to_indices(grid, product.obs_times)
+    level_now = np.array([0.9, 1.05, 1.2])
+    prices = [
+        price_from_state_mc(product, market, grid, level_now, obs_idx, 1500, rng=np.random.default_rng(11),
+                            sparse_grid=True, backend=backend)
+        for backend in ("cube", "fused")
+    ]
+    assert prices[1] == pytest.approx(prices[0], rel=1e-12)
+
+
+def test_scalar_kernel_matches_numpy_walk(monkeypatch):
+    # the numba kernel's logic, run as plain Python
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.25, 0.5, 0.75, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.2, 0.25, 0.3]),
+        corr=np.array([[1.0, 0.5, 0.3], [0.5, 1.0, 0.4], [0.3, 0.4, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=52)
+    obs_idx = obs_times_to_indices(grid, product.obs_times)
+    results = [fused.discounted_payoffs_fused(product, market, grid, 200, np.random.default_rng(0), obs_idx,
+                                              use_numba=False)]
+    monkeypatch.setattr(fused, "_walk_numpy", fused._walk_paths)
+    results.append(fused.discounted_payoffs_fused(product, market, grid, 200, np.random.default_rng(0), obs_idx,
+                                                  use_numba=False))
+    np.testing.assert_allclose(results[1][0], results[0][0], rtol=1e-12)
+    np.testing.assert_array_equal(results[1][1], results[0][1])
+
+
+def test_numba_kernel_matches_numpy_walk():
+    pytest.importorskip("numba")
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.25, 0.5, 0.75, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.2, 0.25, 0.3]),
+        corr=np.array([[1.0, 0.5, 0.3], [0.5, 1.0, 0.4], [0.3, 0.4, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=52)
+    obs_idx = obs_times_to_indices(grid, product.obs_times)
+    disc_jit, taus_jit = fused.discounted_payoffs_fused(product, market, grid, 2000, np.random.default_rng(0),
+                                                        obs_idx, use_numba=True)
+    disc_np, taus_np = fused.discounted_payoffs_fused(product, market, grid, 2000, np.random.default_rng(0),
+                                                      obs_idx, use_numba=False)
+    np.testing.assert_allclose(disc_jit, disc_np, rtol=1e-12)
+    np.testing.assert_array_equal(taus_jit, taus_np)
+
+
+def test_fused_rejects_unsupported_modes():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.25, 0.5, 0.75, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.2, 0.25, 0.3]),
+        corr=np.array([[1.0, 0.5, 0.3], [0.5, 1.0, 0.4], [0.3, 0.4, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=52)
+    with pytest.raises(ValueError):
+        price_autocallable_mc(product, market, grid, 100, backend="fused", antithetic=True)
+    with pytest.raises(ValueError):
+        price_autocallable_mc(product, market, grid, 100, backend="fused", dtype=np.float32)
+    with pytest.raises(ValueError):
+        price_autocallable_mc(product, market, grid, 100, backend="jit")
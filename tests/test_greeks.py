@@ -1,7 +1,9 @@
 import numpy as np
+import pytest
 from desk_sim.instruments import AutocallableWorstOf
 from desk_sim.market import MarketParams, make_time_grid
-from desk_sim.greeks import vega_fd, delta_fd
+from desk_sim.greeks import vega_fd, delta_fd, greeks_mc
+from desk_sim.pricer_mc import price_autocallable_mc
 
 
 def test_greeks_run_and_shapes():
@@ -29,3 +31,36 @@ def test_greeks_run_and_shapes():
     assert vegas.shape == (2,)
     assert np.all(np.isfinite(deltas))
     assert np.all(np.isfinite(vegas))
+
+
+def test_greeks_mc_matches_fd_on_shared_normals():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.5, 1.0]),
+        coupon_rate=0.06,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.01,
+        vols=np.array([0.2, 0.25]),
+        corr=np.array([[1.0, 0.4], [0.4, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=252)
+    spot0 = np.array([100.0, 100.0])
+
+    res = greeks_mc(product, market, grid, n_paths=5000, spot0=spot0, rng_seed=1)
+
+    # same normals as the pricer with the same seed
+    base = price_autocallable_mc(product, market, grid, 5000, rng=np.random.default_rng(1))
+    assert res["price"] == pytest.approx(base, rel=1e-12)
+
+    # forward differences rebuilt from the shared bumps agree with delta_fd / vega_fd
+    deltas = delta_fd(product, market, grid, n_paths=5000, spot0=spot0, rel_bump=0.01, rng_seed=1)
+    vegas = vega_fd(product, market, grid, n_paths=5000, abs_bump=0.01, rng_seed=1)
+    assert np.allclose((res["price_spot_up"] - res["price"]) / (spot0 * 0.01), deltas, rtol=1e-8)
+    assert np.allclose((res["price_vol_up"] - res["price"]) / 0.01, vegas, rtol=1e-6, atol=1e-6)
+
+    assert res["gamma"].shape == (2,)
+    assert np.all(np.isfinite(res["gamma"]))
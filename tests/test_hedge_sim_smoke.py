@@ -1,7 +1,9 @@
 import numpy as np
 from desk_sim.instruments import AutocallableWorstOf
 from desk_sim.market import MarketParams, make_time_grid
-from desk_sim.hedge_sim import run_delta_hedge_one_path
+from desk_sim.hedge_sim import (
+    run_delta_hedge_one_path, run_delta_hedge_batch, hedge_batch_to_frame, hedge_error_quantiles,
+)
 
 def test_hedge_sim_runs():
     product = AutocallableWorstOf(
@@ -28,3 +30,111 @@ def test_hedge_sim_runs():
     )
     assert len(df) > 0
     assert "pnl_total" in df.columns
+
+
+def test_hedge_sim_runs_with_lr_delta():
+    product = AutocallableWorstOf(
+        maturity=0.25,
+        obs_times=np.array([0.25]),
+        coupon_rate=0.05,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.0,
+        vols=np.array([0.2, 0.2]),
+        corr=np.array([[1.0, 0.2],[0.2, 1.0]])
+    )
+    grid = make_time_grid(product.maturity, steps_per_year=252)
+
+    df = run_delta_hedge_one_path(
+        product, market, grid,
+        n_paths_pricing=1000,
+        rng_seed_path=1,
+        rng_seed_pricer=2,
+        delta_method="lr"
+    )
+    assert len(df) > 0
+    assert np.all(np.isfinite(df["delta_0"]))
+
+
+def test_hedge_sim_rolling_revaluation_close_to_resimulation():
+    product = AutocallableWorstOf(
+        maturity=0.5,
+        obs_times=np.array([0.25, 0.5]),
+        coupon_rate=0.05,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.01,
+        vols=np.array([0.2, 0.2]),
+        corr=np.array([[1.0, 0.2],[0.2, 1.0]])
+    )
+    grid = make_time_grid(product.maturity, steps_per_year=52)
+
+    df_roll = run_delta_hedge_one_path(product, market, grid, n_paths_pricing=5000,
+                                       rng_seed_path=1, rng_seed_pricer=2, reval_mode="rolling")
+    df_full = run_delta_hedge_one_path(product, market, grid, n_paths_pricing=5000,
+                                       rng_seed_path=1, rng_seed_pricer=2)
+
+    assert len(df_roll) == len(df_full)
+    assert np.allclose(df_roll["S0"], df_full["S0"])
+    assert np.max(np.abs(df_roll["V_product"] - df_full["V_product"])) < 1.0
+
+
+def test_hedge_batch_path_zero_matches_one_path_rolling():
+    product = AutocallableWorstOf(
+        maturity=0.5,
+        obs_times=np.array([0.25, 0.5]),
+        coupon_rate=0.05,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.01,
+        vols=np.array([0.2, 0.2]),
+        corr=np.array([[1.0, 0.2],[0.2, 1.0]])
+    )
+    grid = make_time_grid(product.maturity, steps_per_year=52)
+
+    res = run_delta_hedge_batch(product, market, grid, n_realised=20, n_paths_pricing=2000,
+                                rng_seed_path=1, rng_seed_pricer=2)
+    df = run_delta_hedge_one_path(product, market, grid, n_paths_pricing=2000,
+                                  rng_seed_path=1, rng_seed_pricer=2, reval_mode="rolling")
+
+    assert res["V_product"].shape == (20, len(df))
+    assert np.allclose(res["V_product"][0], df["V_product"], rtol=1e-12)
+    assert np.allclose(res["pnl_hedge"][0], df["pnl_hedge"], rtol=1e-9, atol=1e-12)
+
+    frame = hedge_batch_to_frame(res)
+    assert len(frame) == 20 * len(df)
+    assert "pnl_total" in frame.columns
+
+    qs = hedge_error_quantiles(res)
+    assert qs[0.01] <= qs[0.5] <= qs[0.99]
+
+
+def test_hedge_sim_float32_pricing_paths():
+    product = AutocallableWorstOf(
+        maturity=0.5,
+        obs_times=np.array([0.25, 0.5]),
+        coupon_rate=0.05,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.01,
+        vols=np.array([0.2, 0.2]),
+        corr=np.array([[1.0, 0.2],[0.2, 1.0]])
+    )
+    grid = make_time_grid(product.maturity, steps_per_year=52)
+
+    df64 = run_delta_hedge_one_path(product, market, grid, n_paths_pricing=5000, reval_mode="rolling")
+    df32 = run_delta_hedge_one_path(product, market, grid, n_paths_pricing=5000, reval_mode="rolling",
+                                    dtype=np.float32)
+    assert np.max(np.abs(df32["V_product"] - df64["V_product"])) < 0.01
@@ -0,0 +1,30 @@
+import numpy as np
+from desk_sim.instruments import AutocallableWorstOf
+from desk_sim.market import MarketParams, make_time_grid
+from desk_sim.greeks import greeks_mc
+from desk_sim.lr_greeks import greeks_lr
+
+
+def test_lr_greeks_agree_with_fd():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.25, 0.5, 0.75, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.25, 0.30]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=252)
+    spot0 = np.array([100.0, 100.0])
+
+    lr = greeks_lr(product, market, grid, n_paths=100_000, spot0=spot0, rng_seed=1)
+    fd = greeks_mc(product, market, grid, n_paths=100_000, spot0=spot0, rng_seed=2, sparse_grid=True)
+
+    assert lr["delta"].shape == (2,)
+    assert np.all(np.abs(lr["delta"] - fd["delta"]) < 5.0 * lr["delta_stderr"] + 0.05 * np.abs(fd["delta"]))
+    assert np.all(np.abs(lr["vega"] - fd["vega"]) < 5.0 * lr["vega_stderr"] + 0.05 * np.abs(fd["vega"]))
@@ -1,5 +1,14 @@
 import numpy as np
-from desk_sim.market import MarketParams, make_time_grid, obs_times_to_indices
+import pytest
+from desk_sim.instruments import AutocallableWorstOf
+from desk_sim.market import (
+    MarketParams, make_time_grid, obs_times_to_indices, sparse_grid_indices, compile_market,
+    nearest_correlation,
+)
+from desk_sim.dynamics import simulate_bs_normalised_levels
+from desk_sim.keys import content_hash
+from desk_sim.scenarios import corr_breakdown, vol_shift
+from desk_sim.greeks import delta_fd, vega_fd
 
 
 def test_make_time_grid():
@@ -29,3 +38,81 @@ def test_market_params_shapes():
     )
     assert market.vols.shape == (2,)
     assert market.corr.shape == (2, 2)
+
+
+def test_sparse_grid_indices_adds_start_and_maturity():
+    grid = make_time_grid(maturity=1.0, steps_per_year=252)
+    sim_idx, obs_pos = sparse_grid_indices(grid, np.array([63, 126, 189]))
+
+    assert list(sim_idx) == [0, 63, 126, 189, 252]
+    assert list(sim_idx[obs_pos]) == [63, 126, 189]
+
+
+def test_market_model_simulates_like_market_params():
+    market = MarketParams(rate=0.02, vols=np.array([0.2, 0.3]), corr=np.array([[1.0, 0.4], [0.4, 1.0]]))
+    model = compile_market(market)
+    assert isinstance(model, MarketParams)
+    assert compile_market(model) is model
+    assert content_hash(model) == content_hash(market)     # shares memo / path cache entries
+
+    grid = make_time_grid(maturity=1.0, steps_per_year=12)
+    paths = simulate_bs_normalised_levels(grid, market, 100, rng=np.random.default_rng(0))
+    paths_model = simulate_bs_normalised_levels(grid, model, 100, rng=np.random.default_rng(0))
+    np.testing.assert_array_equal(paths_model, paths)
+
+
+def test_market_model_derived_bumps_reuse_cache():
+    model = compile_market(MarketParams(rate=0.02, vols=np.array([0.2, 0.3]), corr=np.array([[1.0, 0.4], [0.4, 1.0]])))
+    jump_dt = np.full(3, 0.25)
+    diffusion, drift = model.jump_constants(jump_dt)
+    assert model.jump_constants(jump_dt)[0] is diffusion
+
+    bumped = model.with_vols(np.array([0.25, 0.3]))
+    assert bumped.chol is model.chol
+    np.testing.assert_allclose(bumped.jump_constants(jump_dt)[0][:, 0], 0.25 * 0.5)
+    assert model.with_rate(0.03).chol is model.chol
+    assert vol_shift(model, np.array([0.01, 0.0])).chol is model.chol
+
+
+def test_non_psd_correlation_is_repaired_in_scenarios_only():
+    corr = np.full((3, 3), -0.7)
+    np.fill_diagonal(corr, 1.0)
+    with pytest.raises(np.linalg.LinAlgError):
+        compile_market(MarketParams(rate=0.0, vols=np.full(3, 0.2), corr=corr))
+    base = compile_market(MarketParams(rate=0.0, vols=np.full(3, 0.2), corr=np.eye(3)))
+    with pytest.raises(np.linalg.LinAlgError):
+        base.with_corr(corr)
+
+    model = base.with_corr(corr, repair=True)
+    np.testing.assert_allclose(np.diag(model.corr), 1.0)
+    np.testing.assert_allclose(model.corr, model.corr.T)
+    assert np.min(np.linalg.eigvalsh(model.corr)) > 0.0
+    np.testing.assert_allclose(model.chol @ model.chol.T, model.corr, atol=1e-12)
+
+    # stress scenarios do not fail on an impossible target correlation
+    stressed = corr_breakdown(base, target_corr=-0.7)
+    np.testing.assert_allclose(stressed.corr, model.corr)
+
+    # a valid correlation matrix is left (numerically) unchanged
+    valid = np.array([[1.0, 0.3, 0.1], [0.3, 1.0, 0.2], [0.1, 0.2, 1.0]])
+    np.testing.assert_allclose(nearest_correlation(valid), valid, atol=1e-12)
+
+
+def test_fd_greeks_reject_invalid_correlation_alike():
+    # compiled (vega_fd) and uncompiled (delta_fd) pricing fail the same way, without repair
+    corr = np.full((3, 3), -0.7)
+    np.fill_diagonal(corr, 1.0)
+    market = MarketParams(rate=0.0, vols=np.full(3, 0.2), corr=corr)
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.5, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=12)
+    with pytest.raises(np.linalg.LinAlgError):
+        delta_fd(product, market, grid, 100, spot0=np.ones(3))
+    with pytest.raises(np.linalg.LinAlgError):
+        vega_fd(product, market, grid, 100)
@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+from desk_sim.mc_stats import RunningStats
+
+
+def test_chunked_updates_match_numpy():
+    rng = np.random.default_rng(0)
+    x = rng.normal(100.0, 5.0, size=1000)
+    taus = rng.uniform(0.0, 1.0, size=1000)
+
+    stats = RunningStats()
+    for start in range(0, 1000, 300):
+        stats.update(x[start:start + 300], taus[start:start + 300], call_count=10)
+
+    diag = stats.to_diagnostics()
+    assert diag["n_paths"] == 1000
+    assert diag["call_probability"] == pytest.approx(40 / 1000)
+    assert diag["avg_discounted_payoff"] == pytest.approx(np.mean(x), rel=1e-12)
+    assert diag["std_discounted_payoff"] == pytest.approx(np.std(x, ddof=1), rel=1e-12)
+    assert diag["avg_tau"] == pytest.approx(np.mean(taus), rel=1e-12)
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+from dataclasses import replace
+from desk_sim.instruments import AutocallableWorstOf
+from desk_sim.market import MarketParams, make_time_grid
+from desk_sim.greeks import delta_fd, vega_fd
+from desk_sim.hedge_sim import run_delta_hedge_one_path
+from desk_sim.memo import PricingMemo, canonical_key
+
+
+def test_canonical_key_is_content_based():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.5, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.2, 0.25]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+    copy = MarketParams(rate=0.02, vols=market.vols.copy(), corr=market.corr.copy())
+    assert canonical_key(product, market, 7) == canonical_key(product, copy, 7)
+    assert canonical_key(product, market, 7) != canonical_key(replace(product, coupon_rate=0.09), market, 7)
+    assert canonical_key(market, 7) != canonical_key(market, 8)
+
+
+def test_lru_eviction_and_stats():
+    memo = PricingMemo(maxsize=2)
+    for key in ("a", "b", "a", "c", "b"):
+        memo.get_or_compute(key, lambda: key.upper())
+    # "b" was evicted by "c" (least recently used after "a" was touched), then recomputed
+    assert memo.stats() == {"hits": 1, "misses": 4, "hit_rate": 0.2, "size": 2, "maxsize": 2}
+
+    with pytest.raises(ValueError):
+        PricingMemo(maxsize=0)
+
+
+def test_greeks_share_base_price():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.5, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.2, 0.25]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=52)
+    spot0 = np.array([100.0, 100.0])
+    memo = PricingMemo()
+
+    assert np.array_equal(delta_fd(product, market, grid, 2000, spot0, memo=memo),
+                          delta_fd(product, market, grid, 2000, spot0))
+    vega_fd(product, market, grid, 2000, memo=memo)
+    assert memo.hits == 1  # vega_fd reused delta_fd's base price
+
+
+def test_hedge_rerun_served_from_memo():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.5, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.2, 0.25]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=12)
+    memo = PricingMemo()
+
+    first = run_delta_hedge_one_path(product, market, grid, n_paths_pricing=1000, memo=memo)
+    misses = memo.misses
+    # every day the fd base price is the day's V
+    assert memo.hits == grid.times.shape[0] - 1
+
+    second = run_delta_hedge_one_path(product, market, grid, n_paths_pricing=1000, memo=memo)
+    assert memo.misses == misses
+    assert first.equals(second)
+    assert first.equals(run_delta_hedge_one_path(product, market, grid, n_paths_pricing=1000))
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from desk_sim.instruments import AutocallableWorstOf
+from desk_sim.market import MarketParams, make_time_grid
+from desk_sim.mc_stats import RunningStats
+from desk_sim.pricer_mc import price_autocallable_mc
+from desk_sim.parallel import (
+    split_paths, spawn_seeds, price_autocallable_mc_parallel, delta_fd_parallel,
+)
+
+
+def test_split_paths():
+    assert split_paths(10, 3) == [4, 3, 3]
+    assert split_paths(2, 4) == [1, 1]
+
+
+def test_parallel_price_is_deterministic_and_merges_worker_streams():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.5, 1.0]),
+        coupon_rate=0.06,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.01,
+        vols=np.array([0.2, 0.25]),
+        corr=np.array([[1.0, 0.4], [0.4, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=52)
+
+    price_a, diag_a = price_autocallable_mc_parallel(product, market, grid, n_paths=4001, seed=11,
+                                                     n_workers=2, return_diag=True)
+    price_b = price_autocallable_mc_parallel(product, market, grid, n_paths=4001, seed=11, n_workers=2)
+    assert price_a == price_b
+    assert diag_a["n_paths"] == 4001
+    assert diag_a["n_workers"] == 2
+
+    # same result as pricing each worker stream serially and merging
+    stats = RunningStats()
+    for n, seed in zip(split_paths(4001, 2), spawn_seeds(11, 2)):
+        _, diag = price_autocallable_mc(product, market, grid, n, rng=np.random.default_rng(seed),
+                                        return_diag=True)
+        part = RunningStats(n, diag["avg_discounted_payoff"], diag["std_discounted_payoff"]**2 * (n - 1),
+                            round(diag["call_probability"] * n), diag["avg_tau"] * n)
+        stats.merge(part)
+    assert price_a == pytest.approx(stats.mean, rel=1e-12)
+
+
+def test_parallel_delta_shapes():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.5, 1.0]),
+        coupon_rate=0.06,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.01,
+        vols=np.array([0.2, 0.25]),
+        corr=np.array([[1.0, 0.4], [0.4, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=52)
+    deltas = delta_fd_parallel(product, market, grid, n_paths=2000, spot0=np.array([100.0, 100.0]),
+                               seed=3, n_workers=2)
+    assert deltas.shape == (2,)
+    assert np.all(np.isfinite(deltas))
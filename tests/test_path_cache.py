@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+from desk_sim.instruments import AutocallableWorstOf
+from desk_sim.market import MarketParams, make_time_grid
+from desk_sim.pricer_mc import price_autocallable_mc
+from desk_sim.greeks import delta_fd
+from desk_sim.path_cache import PathCache
+
+
+def test_cache_hit_reproduces_price_and_rng_stream(tmp_path):
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.5, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.2, 0.25]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=52)
+    cache = PathCache(str(tmp_path))
+
+    rng = np.random.default_rng(7)
+    expected = price_autocallable_mc(product, market, grid, 2000, rng=rng)
+    expected_next = rng.standard_normal()
+
+    for _ in range(2):
+        rng = np.random.default_rng(7)
+        assert price_autocallable_mc(product, market, grid, 2000, rng=rng, path_cache=cache) == expected
+        assert rng.standard_normal() == expected_next
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # a different seed or market is a different entry
+    price_autocallable_mc(product, market, grid, 2000, rng=np.random.default_rng(8), path_cache=cache)
+    assert cache.misses == 2
+
+
+def test_greeks_share_cached_paths(tmp_path):
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.5, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.2, 0.25]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=52)
+    cache = PathCache(str(tmp_path))
+    spot0 = np.array([100.0, 100.0])
+
+    expected = delta_fd(product, market, grid, 2000, spot0, rng_seed=3)
+    assert np.array_equal(delta_fd(product, market, grid, 2000, spot0, rng_seed=3, path_cache=cache), expected)
+    assert cache.misses == 1 and cache.hits == 2
+
+
+def test_lru_eviction_keeps_directory_under_budget(tmp_path):
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.5, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.2, 0.25]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=52)
+    one_entry = 2000 * grid.times.shape[0] * 2 * 8
+    cache = PathCache(str(tmp_path), max_bytes=int(2.5 * one_entry))
+
+    for seed in range(4):
+        price_autocallable_mc(product, market, grid, 2000, rng=np.random.default_rng(seed), path_cache=cache)
+    assert cache.size_bytes() <= cache.max_bytes
+    assert len(list(tmp_path.glob("*.npy"))) == 2
+
+    with pytest.raises(ValueError):
+        PathCache(str(tmp_path), max_bytes=0)
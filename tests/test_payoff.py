@@ -1,6 +1,6 @@
 import numpy as np
 import pytest
-from desk_sim.instruments import AutocallableWorstOf, payoff_and_tau_from_levels
+from desk_sim.instruments import AutocallableWorstOf, payoff_and_tau_from_levels, payoff_and_tau_batch
 
 
 def test_autocall_first_observation():
@@ -64,3 +64,25 @@ def test_no_autocall_unprotected():
 
     assert tau == pytest.approx(1.0)
     assert payoff == pytest.approx(40.0)
+
+
+def test_batch_matches_scalar_bit_for_bit():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.25, 0.5, 0.75, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+
+    rng = np.random.default_rng(0)
+    paths = np.exp(0.3 * rng.standard_normal((2000, 9, 3)))
+    obs_indices = np.array([2, 4, 6, 8])
+
+    payoffs, taus = payoff_and_tau_batch(product, paths, obs_indices)
+
+    for p in range(paths.shape[0]):
+        payoff, tau = payoff_and_tau_from_levels(product, paths[p], obs_indices)
+        assert payoffs[p] == payoff
+        assert taus[p] == tau
@@ -0,0 +1,90 @@
+import numpy as np
+from desk_sim import profiling
+from desk_sim.instruments import AutocallableWorstOf
+from desk_sim.market import MarketParams, make_time_grid
+from desk_sim.pricer_mc import price_autocallable_mc
+from desk_sim.hedge_sim import run_delta_hedge_one_path
+
+
+def test_disabled_hooks_record_nothing():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.5, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.2, 0.25]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=12)
+    profiling.reset()
+    assert not profiling.is_enabled()
+    assert profiling.stage("x") is profiling.stage("y")   # shared no-op object
+
+    _, diag = price_autocallable_mc(product, market, grid, 500, rng=np.random.default_rng(0), return_diag=True)
+    assert profiling.report() == {}
+    assert "profile" not in diag
+
+
+def test_profiling_counts_stages_and_paths():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.5, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.2, 0.25]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=12)
+
+    with profiling.session():
+        price, diag = price_autocallable_mc(product, market, grid, 1000, rng=np.random.default_rng(0),
+                                            chunk_size=400, return_diag=True)
+    assert not profiling.is_enabled()
+
+    profile = diag["profile"]
+    assert profile["price_autocallable_mc"]["calls"] == 1
+    assert profile["price_autocallable_mc"]["paths"] == 1000
+    assert profile["dynamics.rng"]["calls"] == 3                # three chunks
+    assert profile["dynamics.rng"]["paths"] == 1000
+    assert profile["payoff.batch"]["paths"] == 1000
+    assert profile["dynamics.rng"]["bytes"] == 1000 * 12 * 2 * 8
+    assert all(entry["time"] >= 0.0 for entry in profile.values())
+
+    # instrumentation does not change results
+    assert price == price_autocallable_mc(product, market, grid, 1000, rng=np.random.default_rng(0), chunk_size=400)
+
+
+def test_hedge_profile_attached_to_frame():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.5, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.2, 0.25]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=12)
+
+    with profiling.session():
+        df = run_delta_hedge_one_path(product, market, grid, n_paths_pricing=200)
+    profile = df.attrs["profile"]
+    assert profile["hedge.reval"]["calls"] == len(df)
+    assert profile["price_from_state_mc"]["calls"] >= len(df)
+    assert profile["hedge.frame"]["calls"] == 1
+    assert "profile" not in run_delta_hedge_one_path(product, market, grid, n_paths_pricing=200).attrs
+    profiling.reset()
@@ -0,0 +1,58 @@
+import numpy as np
+from desk_sim.instruments import AutocallableWorstOf
+from desk_sim.market import MarketParams, make_time_grid
+from desk_sim.proxy import RegressionProxy, build_regression_proxy, proxy_error_vs_mc
+from desk_sim.hedge_sim import run_delta_hedge_one_path
+
+
+def test_proxy_close_to_mc_and_roundtrips(tmp_path):
+    product = AutocallableWorstOf(
+        maturity=0.5,
+        obs_times=np.array([0.25, 0.5]),
+        coupon_rate=0.05,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.01,
+        vols=np.array([0.2, 0.25]),
+        corr=np.array([[1.0, 0.3], [0.3, 1.0]])
+    )
+    grid = make_time_grid(maturity=0.5, steps_per_year=52)
+    proxy = build_regression_proxy(product, market, grid, n_paths=20_000, rng_seed=1)
+
+    assert proxy.coefs.shape[0] == len(grid.times) - 1
+    assert proxy.delta(0, np.ones(2)).shape == (2,)
+
+    report = proxy_error_vs_mc(proxy, product, market, grid,
+                               t_indices=np.array([0, 5]), levels=np.array([[1.0, 1.0], [0.95, 1.02]]),
+                               n_paths=20_000)
+    assert report["max_abs_error"] < 0.5
+
+    path = tmp_path / "proxy.npz"
+    proxy.save(str(path))
+    loaded = RegressionProxy.load(str(path))
+    assert loaded.price(3, np.array([0.9, 1.1])) == proxy.price(3, np.array([0.9, 1.1]))
+
+
+def test_hedge_sim_runs_with_proxy():
+    product = AutocallableWorstOf(
+        maturity=0.5,
+        obs_times=np.array([0.25, 0.5]),
+        coupon_rate=0.05,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.01,
+        vols=np.array([0.2, 0.25]),
+        corr=np.array([[1.0, 0.3], [0.3, 1.0]])
+    )
+    grid = make_time_grid(maturity=0.5, steps_per_year=52)
+    proxy = build_regression_proxy(product, market, grid, n_paths=5000, rng_seed=1)
+
+    df = run_delta_hedge_one_path(product, market, grid, rng_seed_path=1, pricing_proxy=proxy)
+    assert len(df) == len(grid.times) - 1
+    assert np.all(np.isfinite(df["V_product"]))
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from desk_sim.instruments import AutocallableWorstOf
+from desk_sim.market import MarketParams, make_time_grid, obs_times_to_indices
+from desk_sim.roll_pricer import price_from_state_mc
+from desk_sim.risk import Position, var_es, revalue_positions, historical_var
+
+
+def test_var_es_on_known_sample():
+    pnl = -np.arange(100.0)             # losses 0..99
+    var, es = var_es(pnl, alpha=0.95)
+    assert var == pytest.approx(94.05)
+    assert es == pytest.approx(np.mean([95, 96, 97, 98, 99]))
+    with pytest.raises(ValueError):
+        var_es(pnl, alpha=1.0)
+
+
+def test_revaluation_matches_price_from_state_and_is_worker_invariant():
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.25, 0.3]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.5, steps_per_year=252)
+    short = AutocallableWorstOf(
+        maturity=0.75,
+        obs_times=np.array([0.25, 0.5, 0.75]),
+        coupon_rate=0.07,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    long = AutocallableWorstOf(
+        maturity=1.5,
+        obs_times=np.array([0.5, 1.0, 1.5]),
+        coupon_rate=0.09,
+        autocall_barrier=1.05,
+        protection_barrier=0.65,
+        notional=100.0,
+    )
+    positions = [
+        Position(short, np.array([0.95, 1.02]), quantity=10.0),
+        Position(long, np.array([0.95, 1.02]), quantity=-4.0),
+    ]
+    rng = np.random.default_rng(0)
+    level_shocks = rng.normal(0.0, 0.02, size=(12, 2))
+    vol_shocks = np.repeat(rng.normal(0.0, 0.01, size=(4, 2)), 3, axis=0)
+    corr_shifts = np.repeat([0.0, 0.1, -0.1, 0.2], 3)
+
+    res = revalue_positions(positions, market, grid, level_shocks, vol_shocks, corr_shifts,
+                            n_paths=4000, seed=2)
+    assert res["values"].shape == (12, 2)
+    assert np.allclose(res["book_pnl"], res["pnl"].sum(axis=1))
+
+    # a single trade valued alone is exactly price_from_state_mc on its sparse grid
+    alone = revalue_positions(positions[1:], market, grid, np.zeros((1, 2)), n_paths=4000, seed=2)
+    obs_idx = obs_times_to_indices(grid, positions[1].product.obs_times)
+    expected = price_from_state_mc(positions[1].product, market, grid, positions[1].level_now, obs_idx, 4000,
+                                   rng=np.random.default_rng(2), sparse_grid=True)
+    assert alone["base_values"][0] == pytest.approx(expected, rel=1e-12)
+    assert alone["pnl"][0, 0] == 0.0
+
+    pooled = historical_var(positions, market, grid, level_shocks, vol_shocks, corr_shifts,
+                            n_paths=4000, seed=2, n_workers=3, alpha=0.9)
+    assert np.array_equal(pooled["values"], res["values"])
+    assert pooled["es"] >= pooled["var"]
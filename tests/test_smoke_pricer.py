@@ -1,7 +1,8 @@
 import numpy as np
+import pytest
 from desk_sim.instruments import AutocallableWorstOf
 from desk_sim.market import MarketParams, make_time_grid
-from desk_sim.pricer_mc import price_autocallable_mc
+from desk_sim.pricer_mc import price_autocallable_mc, price_autocallable_rqmc
 
 
 def test_pricer_runs_and_returns_reasonable_number():
@@ -33,3 +34,111 @@ def test_pricer_runs_and_returns_reasonable_number():
 
     # very loose sanity bounds
     assert 0.0 < price < 200.0
+
+
+def test_sparse_grid_matches_dense_within_mc_error():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.25, 0.5, 0.75, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.25, 0.30]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=252)
+
+    dense, diag_dense = price_autocallable_mc(
+        product, market, grid, n_paths=20_000, rng=np.random.default_rng(1), return_diag=True
+    )
+    sparse, diag_sparse = price_autocallable_mc(
+        product, market, grid, n_paths=20_000, rng=np.random.default_rng(2), return_diag=True,
+        sparse_grid=True
+    )
+
+    se = np.hypot(diag_dense["std_discounted_payoff"], diag_sparse["std_discounted_payoff"]) / np.sqrt(20_000)
+    assert abs(dense - sparse) < 4.0 * se
+
+
+def test_streaming_diagnostics_do_not_depend_on_chunk_size():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.5, 1.0]),
+        coupon_rate=0.06,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.01,
+        vols=np.array([0.2, 0.25]),
+        corr=np.array([[1.0, 0.4], [0.4, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=52)
+
+    _, diag_full = price_autocallable_mc(product, market, grid, n_paths=3000,
+                                         rng=np.random.default_rng(7), return_diag=True)
+    for chunk_size in (1000, 777):
+        _, diag = price_autocallable_mc(product, market, grid, n_paths=3000,
+                                        rng=np.random.default_rng(7), return_diag=True,
+                                        chunk_size=chunk_size)
+        assert diag["n_paths"] == diag_full["n_paths"]
+        assert diag["call_probability"] == diag_full["call_probability"]
+        for key in ("avg_tau", "avg_discounted_payoff", "std_discounted_payoff"):
+            assert diag[key] == pytest.approx(diag_full[key], rel=1e-12)
+
+
+def test_rqmc_beats_pseudo_random_standard_error():
+    pytest.importorskip("scipy")
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.25, 0.5, 0.75, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.25, 0.30]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=252)
+
+    price_q, diag_q = price_autocallable_rqmc(product, market, grid, n_paths=1024, n_replicates=8,
+                                              rng=np.random.default_rng(0))
+    price_p, diag_p = price_autocallable_mc(product, market, grid, n_paths=8 * 1024,
+                                            rng=np.random.default_rng(0), return_diag=True, sparse_grid=True)
+    se_p = diag_p["std_discounted_payoff"] / np.sqrt(8 * 1024)
+
+    assert diag_q["n_paths"] == 8 * 1024
+    assert diag_q["std_error"] < se_p
+    assert abs(price_q - price_p) < 4.0 * se_p
+
+
+def test_float32_price_matches_float64_on_same_draws():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.25, 0.5, 0.75, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.25, 0.30]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=252)
+
+    p64, d64 = price_autocallable_mc(product, market, grid, 20_000, rng=np.random.default_rng(1), return_diag=True)
+    p32, d32 = price_autocallable_mc(product, market, grid, 20_000, rng=np.random.default_rng(1), return_diag=True,
+                                     dtype=np.float32)
+    assert isinstance(p32, float)
+    # far below the Monte Carlo error
+    assert abs(p32 - p64) < 0.01 * d64["std_discounted_payoff"] / np.sqrt(20_000)
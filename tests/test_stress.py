@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from desk_sim.instruments import AutocallableWorstOf
+from desk_sim.market import MarketParams, make_time_grid
+from desk_sim.pricer_mc import price_autocallable_mc
+from desk_sim.scenarios import vol_up, corr_breakdown
+from desk_sim.stress import ShockSpec, shock_grid, run_stress
+
+
+def test_shocks_match_scenarios_and_plain_pricer():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.25, 0.5, 0.75, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.25, 0.3]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=252)
+    assert np.allclose(ShockSpec(vol_mult=1.2).apply(market).vols, vol_up(market, 0.2).vols)
+    assert np.allclose(ShockSpec(corr_target=0.0).apply(market).corr, corr_breakdown(market, 0.0).corr)
+
+    shocks = [ShockSpec("base"), ShockSpec("vol_up", vol_mult=1.2), ShockSpec("rates", rate_shift=0.01)]
+    table = run_stress(product, market, grid, shocks, n_paths=5000, seed=4)
+
+    assert list(table["scenario"]) == ["base", "vol_up", "rates"]
+    assert table["pnl"].iloc[0] == 0.0
+    expected = price_autocallable_mc(product, vol_up(market, 0.2), grid, 5000,
+                                     rng=np.random.default_rng(4), sparse_grid=True)
+    assert table["price"].iloc[1] == pytest.approx(expected, rel=1e-12)
+    # common random numbers: the PnL is much sharper than the price itself
+    assert table["pnl_std_error"].iloc[1] < 0.7 * table["std_error"].iloc[1]
+
+
+def test_grid_is_worker_count_invariant():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.25, 0.5, 0.75, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.25, 0.3]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=252)
+    shocks = shock_grid(vol_mults=(0.8, 1.2), corr_targets=(None, 0.0), spot_shocks=(-0.2, 0.0))
+    assert len(shocks) == 8
+
+    serial = run_stress(product, market, grid, shocks, n_paths=2000, seed=1, n_workers=1)
+    pooled = run_stress(product, market, grid, shocks, n_paths=2000, seed=1, n_workers=3)
+    assert np.array_equal(serial["price"].to_numpy(), pooled["price"].to_numpy())
+    # spots down 20% cannot be worth more than unshocked spots
+    down = serial[serial["spot_shock"] == -0.2]["price"].to_numpy()
+    flat = serial[serial["spot_shock"] == 0.0]["price"].to_numpy()
+    assert np.all(down <= flat)
+
+
+def test_impossible_correlation_target_is_repaired():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.25, 0.5, 0.75, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.25, 0.3]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=252)
+    corr = np.array([[1.0, 0.5, 0.3], [0.5, 1.0, 0.4], [0.3, 0.4, 1.0]])
+    market3 = MarketParams(rate=market.rate, vols=np.array([0.2, 0.25, 0.3]), corr=corr)
+    table = run_stress(product, market3, grid, [ShockSpec("base"), ShockSpec("anti", corr_target=-0.9)], 500)
+    assert np.all(np.isfinite(table["price"]))
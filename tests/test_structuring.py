@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from dataclasses import replace
+from desk_sim.instruments import AutocallableWorstOf
+from desk_sim.market import MarketParams, make_time_grid
+from desk_sim.pricer_mc import price_autocallable_mc
+from desk_sim.structuring import price_variants, solve_par_coupon
+
+
+def test_variants_match_individual_pricer_on_same_paths():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.25, 0.5, 0.75, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.2, 0.25]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=252)
+    res = price_variants(
+        product, market, grid, n_paths=20_000,
+        coupon_rates=np.array([0.04, 0.08]),
+        autocall_barriers=np.array([0.95, 1.05]),
+        protection_barriers=np.array([0.6, 0.7, 1.2]),
+        rng=np.random.default_rng(5),
+    )
+    assert res["prices"].shape == (2, 2, 3)
+    assert np.all(np.isnan(res["prices"][:, :, 2]))
+
+    variant = replace(product, coupon_rate=0.04, autocall_barrier=1.05, protection_barrier=0.7)
+    single = price_autocallable_mc(variant, market, grid, 20_000, rng=np.random.default_rng(5), sparse_grid=True)
+    assert res["prices"][0, 1, 1] == pytest.approx(single, rel=1e-12)
+
+
+def test_par_coupon_reprices_to_par():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.25, 0.5, 0.75, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.6,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.2, 0.25]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=252)
+    res = solve_par_coupon(product, market, grid, n_paths=20_000, rng=np.random.default_rng(1))
+    coupon = float(res["coupons"][0, 0])
+    assert 0.0 < coupon < 0.5
+
+    at_par = replace(product, coupon_rate=coupon)
+    price = price_autocallable_mc(at_par, market, grid, 20_000, rng=np.random.default_rng(1), sparse_grid=True)
+    assert price == pytest.approx(product.notional, rel=1e-10)
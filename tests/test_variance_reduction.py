@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from desk_sim.instruments import AutocallableWorstOf, payoff_and_tau_batch
+from desk_sim.market import MarketParams, make_time_grid
+from desk_sim.dynamics import levels_from_normals
+from desk_sim.pricer_mc import price_autocallable_mc
+from desk_sim.variance_reduction import conditional_final_discounted_payoff
+
+
+def test_conditional_final_step_matches_brute_force():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.5, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.7,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.25, 0.3, 0.2]),
+        corr=np.array([[1.0, 0.5, 0.3], [0.5, 1.0, 0.4], [0.3, 0.4, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=252)
+    sim_idx = np.array([0, 126, 252])
+    obs_pos = np.array([1, 2])
+
+    # one fixed path state, only the last asset's final normal varies
+    rng = np.random.default_rng(0)
+    Z = np.repeat(np.array([[[-0.3, 0.1, -0.2], [0.4, -0.6, 0.0]]]), 400_000, axis=0)
+    Z[:, 1, 2] = rng.standard_normal(400_000)
+
+    paths = levels_from_normals(grid, market, Z, sim_idx)
+    payoffs, taus = payoff_and_tau_batch(product, paths, obs_pos)
+    brute = np.mean(np.exp(-market.rate * taus) * payoffs)
+
+    cond = conditional_final_discounted_payoff(product, market, paths[:1], Z[:1, 1, :], 0.5, True, 1.0)
+    assert cond[0] == pytest.approx(brute, abs=0.1)
+
+
+def test_variance_reduction_modes_are_unbiased_and_reported():
+    product = AutocallableWorstOf(
+        maturity=1.0,
+        obs_times=np.array([0.5, 1.0]),
+        coupon_rate=0.08,
+        autocall_barrier=1.0,
+        protection_barrier=0.7,
+        notional=100.0,
+    )
+    market = MarketParams(
+        rate=0.02,
+        vols=np.array([0.25, 0.3, 0.2]),
+        corr=np.array([[1.0, 0.5, 0.3], [0.5, 1.0, 0.4], [0.3, 0.4, 1.0]])
+    )
+    grid = make_time_grid(maturity=1.0, steps_per_year=252)
+
+    ref, diag_ref = price_autocallable_mc(product, market, grid, n_paths=100_000,
+                                          rng=np.random.default_rng(1), return_diag=True, sparse_grid=True)
+    price, diag = price_autocallable_mc(product, market, grid, n_paths=20_000, rng=np.random.default_rng(2),
+                                        return_diag=True, sparse_grid=True,
+                                        antithetic=True, control_variate=True, conditional_final=True)
+
+    se_ref = diag_ref["std_discounted_payoff"] / np.sqrt(100_000)
+    assert abs(price - ref) < 4.0 * np.hypot(se_ref, diag["std_error"])
+    assert diag["variance_reduction_factor"] > 1.0
+    assert diag["n_paths"] == 20_000